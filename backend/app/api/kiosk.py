@@ -3,36 +3,74 @@ import asyncio
 import json
 import logging
 import time
+from typing import Optional
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
+from ..core.config import settings
 from ..core.face import engine
 from ..core.models import KioskStatusResponse
-from ..kiosk.state import kiosk_state
+from ..kiosk.state import FrameBroadcaster, kiosk_state
+
+try:
+    import msgpack
+except ImportError:
+    # Optional: only needed by WebSocket clients that ask for ?format=msgpack
+    msgpack = None
 
 router = APIRouter(prefix="/kiosk", tags=["kiosk"])
 logger = logging.getLogger(__name__)
 
+# Wall-clock/monotonic reference pair for fast_time()
+_T0_WALL = time.time()
+_T0_MONO = time.monotonic()
+
+
+def fast_time() -> float:
+    """Approximate time.time() derived from the monotonic clock.
+    
+    Drifts only by NTP slew since import, which is irrelevant for
+    heartbeat timestamps.
+    """
+    return _T0_WALL + (time.monotonic() - _T0_MONO)
+
+
+# Per-part MJPEG header; only the Content-Length varies between frames
+MJPEG_HEADER_TMPL = b"Content-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n"
+MJPEG_BOUNDARY = b"--frame\r\n"
+# Each part is terminated by the next boundary so browsers paint a frame as
+# soon as it has arrived rather than when the following part starts.
+MJPEG_PART_END = b"\r\n" + MJPEG_BOUNDARY
+
+
+# Shared producer so part headers are built once per frame for all clients
+_broadcaster = FrameBroadcaster(kiosk_state, MJPEG_HEADER_TMPL)
+
+# How long /frame waits for the kiosk loop to publish a fresh frame when
+# no stream is open (frames are only encoded while someone is watching)
+FRAME_REQUEST_TIMEOUT = 1.0
+
 
 async def generate_mjpeg():
-    """Generator for MJPEG stream."""
-    boundary = b"--frame\r\n"
+    """Generator for MJPEG stream.
     
-    while True:
-        frame = kiosk_state.get_frame()
-        
-        if frame is not None:
-            yield (
-                boundary +
-                b"Content-Type: image/jpeg\r\n" +
-                f"Content-Length: {len(frame)}\r\n\r\n".encode() +
-                frame +
-                b"\r\n"
-            )
+    The header and JPEG payload are yielded as separate chunks so the frame
+    bytes are handed to the transport as-is instead of being concatenated.
+    """
+    queue = _broadcaster.subscribe()
+    try:
+        yield MJPEG_BOUNDARY
         
-        # Control frame rate for streaming
-        await asyncio.sleep(1.0 / 15)  # ~15 FPS for stream
+        while True:
+            # Latest frame published by the kiosk loop
+            header, frame = await queue.get()
+            yield header
+            yield frame
+            yield MJPEG_PART_END
+    finally:
+        _broadcaster.unsubscribe(queue)
 
 
 @router.get("/stream")
@@ -50,40 +88,88 @@ async def mjpeg_stream():
 @router.get("/frame")
 async def get_current_frame():
     """Get the current frame as a single JPEG image."""
+    if not kiosk_state.has_subscribers:
+        # The last published frame may be stale; ask the loop for a new one
+        kiosk_state.add_subscriber()
+        try:
+            await asyncio.wait_for(kiosk_state.wait_for_frame(), timeout=FRAME_REQUEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            kiosk_state.remove_subscriber()
+    
     frame = kiosk_state.get_frame()
     
     if frame is None:
-        return StreamingResponse(
-            iter([b""]),
-            media_type="image/jpeg",
-            status_code=503,
-        )
+        return Response(status_code=503, media_type="image/jpeg")
     
-    return StreamingResponse(
-        iter([frame]),
-        media_type="image/jpeg",
-    )
+    return Response(content=frame, media_type="image/jpeg")
 
 
 @router.get("/status", response_model=KioskStatusResponse)
 async def get_kiosk_status():
     """Get the current kiosk status."""
-    return KioskStatusResponse(
-        running=kiosk_state.running,
-        camera_connected=kiosk_state.camera_connected,
-        fps=round(kiosk_state.fps, 1),
-        frame_count=kiosk_state.frame_count,
-        people_count=len(engine.people),
-        cuda_error=engine.cuda_error,
-    )
+    # frame_count changes with every frame, so there is nothing worth caching;
+    # serialize the plain fields directly, skipping response_model validation
+    body = orjson.dumps({
+        "running": kiosk_state.running,
+        "camera_connected": kiosk_state.camera_connected,
+        "fps": round(kiosk_state.fps, 1),
+        "frame_count": kiosk_state.frame_count,
+        "people_count": engine.people_count,
+        "cuda_error": engine.cuda_error,
+    })
+    return Response(content=body, media_type="application/json")
+
+
+# Serialized heartbeat with a timestamp placeholder, keyed on the status it
+# reports; only the timestamp is patched in per message
+_HEARTBEAT_TS_PLACEHOLDER = b'"__timestamp__"'
+_heartbeat_cache: tuple[Optional[tuple], bytes] = (None, b"")
+
+
+def _encode_message(message: dict, use_msgpack: bool) -> bytes:
+    """Serialize a WebSocket message as msgpack or JSON."""
+    if use_msgpack:
+        return msgpack.packb(message)
+    return orjson.dumps(message)
+
+
+def _heartbeat_message(timestamp: float, use_msgpack: bool = False) -> bytes:
+    """Build a serialized heartbeat message for the WebSocket."""
+    global _heartbeat_cache
+    
+    key = (kiosk_state.running, kiosk_state.camera_connected, round(kiosk_state.fps, 1))
+    if use_msgpack:
+        running, camera_connected, fps = key
+        return _encode_message({
+            "type": "heartbeat",
+            "timestamp": timestamp,
+            "running": running,
+            "camera_connected": camera_connected,
+            "fps": fps,
+        }, use_msgpack)
+    
+    if _heartbeat_cache[0] != key:
+        running, camera_connected, fps = key
+        _heartbeat_cache = (key, orjson.dumps({
+            "type": "heartbeat",
+            "timestamp": "__timestamp__",
+            "running": running,
+            "camera_connected": camera_connected,
+            "fps": fps,
+        }))
+    
+    return _heartbeat_cache[1].replace(_HEARTBEAT_TS_PLACEHOLDER, repr(timestamp).encode())
 
 
 @router.websocket("/ws")
-async def kiosk_websocket(websocket: WebSocket):
+async def kiosk_websocket(websocket: WebSocket, format: str = "json"):
     """
     WebSocket for real-time recognition events.
     
-    Sends messages in the format:
+    Messages are sent as binary frames containing UTF-8 JSON, or msgpack when
+    connecting with ?format=msgpack (and msgpack is installed), in the format:
     {
         "type": "recognition",
         "faces": [...],
@@ -91,18 +177,27 @@ async def kiosk_websocket(websocket: WebSocket):
         "timestamp": 1234567890.123,
         "process_time_ms": 85.2
     }
+    Each face carries its box in pixels ("box") and as fractions of the
+    frame size ("box_norm"). An event with no faces is sent when the last
+    faces leave the frame.
     """
     await websocket.accept()
     logger.info("Kiosk WebSocket client connected")
     
+    use_msgpack = format == "msgpack"
+    if use_msgpack and msgpack is None:
+        logger.warning("msgpack requested but not installed, sending JSON")
+        use_msgpack = False
+    
     try:
         # Send initial status
-        await websocket.send_json({
+        await websocket.send_bytes(_encode_message({
             "type": "status",
             "running": kiosk_state.running,
             "camera_connected": kiosk_state.camera_connected,
-            "people_count": len(engine.people),
-        })
+            "people_count": engine.people_count,
+            "overlay_client_side": settings.overlay_client_side,
+        }, use_msgpack))
         
         while True:
             # Wait for recognition events
@@ -112,23 +207,17 @@ async def kiosk_websocket(websocket: WebSocket):
                     timeout=5.0
                 )
                 
-                await websocket.send_json({
+                await websocket.send_bytes(_encode_message({
                     "type": "recognition",
                     "faces": event.faces,
                     "themes_played": event.themes_played,
                     "timestamp": event.timestamp,
                     "process_time_ms": event.process_time_ms,
-                })
+                }, use_msgpack))
                 
             except asyncio.TimeoutError:
                 # Send heartbeat
-                await websocket.send_json({
-                    "type": "heartbeat",
-                    "timestamp": time.time(),
-                    "running": kiosk_state.running,
-                    "camera_connected": kiosk_state.camera_connected,
-                    "fps": round(kiosk_state.fps, 1),
-                })
+                await websocket.send_bytes(_heartbeat_message(fast_time(), use_msgpack))
                 
     except WebSocketDisconnect:
         logger.info("Kiosk WebSocket client disconnected")
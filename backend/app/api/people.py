@@ -1,12 +1,15 @@
 """People management API routes."""
+import re
+import tempfile
 import uuid
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File
+from fastapi.responses import FileResponse, Response
 
-from ..core.face import engine
+from ..core.face import Person, engine
 from ..core.models import (
     PersonCreate,
     PersonResponse,
@@ -19,6 +22,111 @@ from ..core.config import settings
 
 router = APIRouter(prefix="/people", tags=["people"])
 
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Files are served in larger chunks than Starlette's 64KB default
+FILE_CHUNK_SIZE = 1 << 20
+
+# Uploaded photos get uuid filenames, so their content never changes
+PHOTO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Filename stem of photos saved by upload_photo (uuid4().hex)
+UPLOADED_PHOTO_STEM = re.compile(r"[0-9a-f]{32}")
+
+
+def _is_not_modified(request: Request, etag: str, mtime: Optional[float] = None) -> bool:
+    """Check the request's conditional headers against a file's validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in tags or "*" in tags
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and mtime is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+    
+    return False
+
+
+def _file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    not_found_detail: str,
+    etag: Optional[str] = None,
+    cache_control: Optional[str] = None,
+) -> Response:
+    """Serve a file, answering conditional requests with 304.
+    
+    Uses a single stat() for the existence check, validators and headers.
+    Without an explicit etag one is derived from the file's mtime and size.
+    """
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    
+    if etag is None:
+        etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    
+    if _is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+    
+    response = FileResponse(
+        path,
+        media_type=media_type,
+        stat_result=stat_result,
+        headers=headers,
+    )
+    response.chunk_size = FILE_CHUNK_SIZE
+    return response
+
+
+async def _save_upload(file: UploadFile, directory: Path) -> tuple[Path, int]:
+    """Stream an upload to a hidden temp file in directory.
+    
+    Returns the temp file path and the number of bytes written. The caller
+    is responsible for moving or removing the file.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=".upload-", delete=False) as tmp:
+        tmp_path = Path(tmp.name)
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
+                size += len(chunk)
+        except BaseException:
+            tmp.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    return tmp_path, size
+
+
+def _require_gallery() -> None:
+    """Reject people requests while the gallery is still loading.
+    
+    The gallery loads in the background after startup; until it is in
+    place the people list is incomplete and edits would race the load.
+    If startup fails the requests are served as usual.
+    """
+    if engine.warming_up:
+        raise HTTPException(status_code=503, detail="People gallery not loaded yet")
+
+
+def _build_person_response(person: Person) -> PersonResponse:
+    """Build a PersonResponse from a Person."""
+    # Fields are cached on the person and already valid, skip validation
+    return PersonResponse.model_construct(**person.summary())
+
 
 def _get_person_response(name: str) -> PersonResponse:
     """Build a PersonResponse from a person name."""
@@ -26,26 +134,31 @@ def _get_person_response(name: str) -> PersonResponse:
     if not person:
         raise HTTPException(status_code=404, detail=f"Person '{name}' not found")
     
-    return PersonResponse(
-        name=person.name,
-        photo_count=len(person.photo_paths),
-        embedding_count=len(person.embeddings),
-        has_theme=person.has_theme(),
-        theme_filename=person.theme_path.name if person.theme_path else None,
-        preview_url=engine.get_preview_url(name),
-    )
+    return _build_person_response(person)
+
+
+# Last list_people result, keyed on the engine's people version
+_people_list_cache: tuple[int, Optional[PersonListResponse]] = (-1, None)
 
 
 @router.get("", response_model=PersonListResponse)
 async def list_people():
     """List all people in the gallery."""
-    people = [_get_person_response(name) for name in sorted(engine.people.keys())]
-    return PersonListResponse(people=people, total=len(people))
+    global _people_list_cache
+    _require_gallery()
+    
+    version = engine.people_version
+    if _people_list_cache[0] != version or _people_list_cache[1] is None:
+        people = [_build_person_response(person) for _, person in sorted(engine.people.items())]
+        _people_list_cache = (version, PersonListResponse.model_construct(people=people, total=len(people)))
+    return _people_list_cache[1]
 
 
 @router.post("", response_model=PersonResponse, status_code=201)
 async def create_person(data: PersonCreate):
     """Create a new person."""
+    _require_gallery()
+    
     if data.name in engine.people:
         raise HTTPException(status_code=409, detail=f"Person '{data.name}' already exists")
     
@@ -56,12 +169,16 @@ async def create_person(data: PersonCreate):
 @router.get("/{name}", response_model=PersonResponse)
 async def get_person(name: str):
     """Get details for a specific person."""
+    _require_gallery()
+    
     return _get_person_response(name)
 
 
 @router.delete("/{name}", status_code=204)
 async def delete_person(name: str):
     """Delete a person and all their data."""
+    _require_gallery()
+    
     if not engine.delete_person(name):
         raise HTTPException(status_code=404, detail=f"Person '{name}' not found")
 
@@ -70,6 +187,8 @@ async def delete_person(name: str):
 @router.get("/{name}/photos", response_model=PhotoListResponse)
 async def list_photos(name: str):
     """List all photos for a person."""
+    _require_gallery()
+    
     person = engine.people.get(name)
     if not person:
         raise HTTPException(status_code=404, detail=f"Person '{name}' not found")
@@ -92,6 +211,8 @@ async def upload_photo(
     file: Annotated[UploadFile, File(description="Face photo to upload")],
 ):
     """Upload a new photo for a person."""
+    _require_gallery()
+    
     if name not in engine.people:
         raise HTTPException(status_code=404, detail=f"Person '{name}' not found")
     
@@ -99,13 +220,15 @@ async def upload_photo(
     ext = Path(file.filename or "photo.jpg").suffix or ".jpg"
     filename = f"{uuid.uuid4().hex}{ext}"
     
-    # Read file content
-    content = await file.read()
-    if not content:
+    # Stream file content to disk
+    tmp_path, size = await _save_upload(file, settings.people_dir / name)
+    if not size:
+        tmp_path.unlink(missing_ok=True)
         raise HTTPException(status_code=400, detail="Empty file")
     
     # Add photo (this also computes embedding)
-    result = engine.add_photo(name, content, filename)
+    result = engine.add_photo_from_path(name, tmp_path, filename)
+    tmp_path.unlink(missing_ok=True)
     if not result:
         raise HTTPException(status_code=400, detail="No face detected in photo")
     
@@ -118,18 +241,35 @@ async def upload_photo(
 
 
 @router.get("/{name}/photos/{photo_id}/file")
-async def get_photo_file(name: str, photo_id: str):
+async def get_photo_file(name: str, photo_id: str, request: Request):
     """Get the actual photo file."""
-    photo_path = settings.people_dir / name / photo_id
-    if not photo_path.exists():
-        raise HTTPException(status_code=404, detail="Photo not found")
+    _require_gallery()
     
-    return FileResponse(photo_path, media_type="image/jpeg")
+    photo_path = settings.people_dir / name / photo_id
+    # Uploaded photos are never rewritten, so their filename is a strong
+    # validator; photos placed in the people directory by hand may be
+    # replaced, so those are revalidated against mtime and size
+    if UPLOADED_PHOTO_STEM.fullmatch(photo_path.stem):
+        etag = f'"{photo_id}"'
+        cache_control = PHOTO_CACHE_CONTROL
+    else:
+        etag = None
+        cache_control = "no-cache"
+    return _file_response(
+        request,
+        photo_path,
+        "image/jpeg",
+        "Photo not found",
+        etag=etag,
+        cache_control=cache_control,
+    )
 
 
 @router.delete("/{name}/photos/{photo_id}", status_code=204)
 async def delete_photo(name: str, photo_id: str):
     """Delete a photo."""
+    _require_gallery()
+    
     if not engine.delete_photo(name, photo_id):
         raise HTTPException(status_code=404, detail="Photo not found")
 
@@ -137,6 +277,8 @@ async def delete_photo(name: str, photo_id: str):
 @router.put("/{name}/preview", response_model=PersonResponse)
 async def set_preview_photo(name: str, photo_id: str):
     """Set the preview photo for a person."""
+    _require_gallery()
+    
     if name not in engine.people:
         raise HTTPException(status_code=404, detail=f"Person '{name}' not found")
     
@@ -150,6 +292,8 @@ async def set_preview_photo(name: str, photo_id: str):
 @router.get("/{name}/theme", response_model=ThemeResponse)
 async def get_theme(name: str):
     """Get the theme song for a person."""
+    _require_gallery()
+    
     person = engine.people.get(name)
     if not person:
         raise HTTPException(status_code=404, detail=f"Person '{name}' not found")
@@ -169,17 +313,21 @@ async def upload_theme(
     file: Annotated[UploadFile, File(description="Theme audio file (MP3, WAV, M4A)")],
 ):
     """Upload or replace the theme song for a person."""
+    _require_gallery()
+    
     if name not in engine.people:
         raise HTTPException(status_code=404, detail=f"Person '{name}' not found")
     
     # Keep original filename for display
     filename = file.filename or "theme.mp3"
     
-    content = await file.read()
-    if not content:
+    tmp_path, size = await _save_upload(file, settings.people_dir / name)
+    if not size:
+        tmp_path.unlink(missing_ok=True)
         raise HTTPException(status_code=400, detail="Empty file")
     
-    result = engine.set_theme(name, content, filename)
+    result = engine.set_theme_from_path(name, tmp_path, filename)
+    tmp_path.unlink(missing_ok=True)
     if not result:
         raise HTTPException(status_code=500, detail="Failed to save theme")
     
@@ -190,15 +338,14 @@ async def upload_theme(
 
 
 @router.get("/{name}/theme/file")
-async def get_theme_file(name: str):
+async def get_theme_file(name: str, request: Request):
     """Get the actual theme audio file."""
+    _require_gallery()
+    
     person = engine.people.get(name)
     if not person or not person.theme_path:
         raise HTTPException(status_code=404, detail="Theme not found")
     
-    if not person.theme_path.exists():
-        raise HTTPException(status_code=404, detail="Theme file not found")
-    
     # Determine media type from extension
     ext = person.theme_path.suffix.lower()
     media_types = {
@@ -208,12 +355,14 @@ async def get_theme_file(name: str):
     }
     media_type = media_types.get(ext, "audio/mpeg")
     
-    return FileResponse(person.theme_path, media_type=media_type)
+    return _file_response(request, person.theme_path, media_type, "Theme file not found")
 
 
 @router.delete("/{name}/theme", status_code=204)
 async def delete_theme(name: str):
     """Delete the theme song for a person."""
+    _require_gallery()
+    
     if not engine.delete_theme(name):
         raise HTTPException(status_code=404, detail="Theme not found")
 
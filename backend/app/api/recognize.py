@@ -1,10 +1,11 @@
 """Recognition API routes."""
 import base64
 import logging
+from typing import Annotated
 
 import cv2
 import numpy as np
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, UploadFile, File
 
 from ..core.face import engine
 from ..core.models import RecognitionRequest, RecognitionResult, FaceMatch, FaceBox, ThemeToPlay
@@ -13,43 +14,75 @@ router = APIRouter(prefix="/recognize", tags=["recognition"])
 logger = logging.getLogger(__name__)
 
 
-@router.post("", response_model=RecognitionResult)
+def _recognize_bgr(image_bgr: np.ndarray) -> RecognitionResult:
+    """Run recognition on an already-decoded BGR image."""
+    faces_data, themes_data = engine.recognize_frame(image_bgr, inplace=True)
+    
+    # Convert to response models
+    faces = [
+        FaceMatch(
+            box=FaceBox(**f["box"]),
+            name=f["name"],
+            distance=f["distance"],
+            is_match=f["is_match"],
+        )
+        for f in faces_data
+    ]
+    
+    themes = [
+        ThemeToPlay(name=t["name"], path=t["path"])
+        for t in themes_data
+    ]
+    
+    return RecognitionResult(faces=faces, play_themes=themes)
+
+
+def _recognize_encoded(image_data: bytes) -> RecognitionResult:
+    """Decode an encoded image (JPEG/PNG) and run recognition on it."""
+    nparr = np.frombuffer(image_data, np.uint8)
+    image_bgr = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    
+    if image_bgr is None:
+        raise HTTPException(status_code=400, detail="Invalid image data")
+    
+    return _recognize_bgr(image_bgr)
+
+
+@router.post("", response_model=RecognitionResult, deprecated=True)
 async def recognize_image(request: RecognitionRequest):
-    """Recognize faces in an uploaded image (one-shot recognition for testing)."""
-    if not engine.is_initialized:
+    """Recognize faces in a base64-encoded image (one-shot recognition for testing).
+    
+    Deprecated: use POST /recognize/upload with a multipart file instead,
+    which avoids the base64 inflation and decode.
+    """
+    if not engine.is_ready:
         raise HTTPException(status_code=503, detail="Face recognition engine not ready")
     
     try:
-        # Decode base64 image
-        image_data = base64.b64decode(request.image_base64)
-        nparr = np.frombuffer(image_data, np.uint8)
-        image_bgr = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image_bgr is None:
-            raise HTTPException(status_code=400, detail="Invalid image data")
-        
-        # Run recognition
-        faces_data, themes_data = engine.recognize_frame(image_bgr)
-        
-        # Convert to response models
-        faces = [
-            FaceMatch(
-                box=FaceBox(**f["box"]),
-                name=f["name"],
-                distance=f["distance"],
-                is_match=f["is_match"],
-            )
-            for f in faces_data
-        ]
-        
-        themes = [
-            ThemeToPlay(name=t["name"], path=t["path"])
-            for t in themes_data
-        ]
-        
-        return RecognitionResult(faces=faces, play_themes=themes)
-        
+        return _recognize_encoded(base64.b64decode(request.image_base64))
+    except HTTPException:
+        raise
     except Exception as exc:
         logger.exception("Recognition failed")
         raise HTTPException(status_code=500, detail=str(exc))
 
+
+@router.post("/upload", response_model=RecognitionResult)
+async def recognize_upload(
+    file: Annotated[UploadFile, File(description="Image to run recognition on")],
+):
+    """Recognize faces in an uploaded image (one-shot recognition for testing)."""
+    if not engine.is_ready:
+        raise HTTPException(status_code=503, detail="Face recognition engine not ready")
+    
+    content = await file.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="Empty file")
+    
+    try:
+        return _recognize_encoded(content)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.exception("Recognition failed")
+        raise HTTPException(status_code=500, detail=str(exc))
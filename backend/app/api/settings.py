@@ -2,6 +2,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
 from ..core.config import settings, runtime_settings_manager, RuntimeSettings
@@ -9,6 +10,13 @@ from ..core.face import engine
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
+# Serialized GET /settings body, keyed on the runtime settings version and
+# the engine state reported in the config section
+_settings_cache: tuple[Optional[tuple], bytes] = (None, b"")
+
+# Last RuntimeSettingsResponse, keyed on the runtime settings version
+_runtime_cache: tuple[int, Optional["RuntimeSettingsResponse"]] = (-1, None)
+
 
 class ConfigSettingsResponse(BaseModel):
     """Read-only configuration settings (require restart to change)."""
@@ -22,6 +30,11 @@ class ConfigSettingsResponse(BaseModel):
     camera_width: int = Field(description="Camera resolution width")
     camera_height: int = Field(description="Camera resolution height")
     use_cuda: bool = Field(description="Whether CUDA GPU acceleration is required")
+    use_tensorrt: bool = Field(description="Whether the TensorRT execution provider is preferred")
+    use_int8: bool = Field(description="Whether INT8-quantized models are used on CPU")
+    use_opencl: bool = Field(description="Whether detection frames are resized through OpenCL")
+    gallery_int8: bool = Field(description="Whether the gallery search index is quantized to int8")
+    overlay_client_side: bool = Field(description="Whether face and mask overlays are drawn by the browser instead of on the stream")
     onnx_providers: list[str] = Field(description="Available ONNX execution providers")
     active_provider: Optional[str] = Field(description="Currently active ONNX execution provider")
     cuda_error: Optional[str] = Field(default=None, description="CUDA error message if use_cuda is set but CUDA is unavailable")
@@ -36,6 +49,7 @@ class RuntimeSettingsResponse(BaseModel):
     audio_cooldown_seconds: float = Field(description="Seconds between theme plays for same person")
     camera_fps: int = Field(description="Target frames per second")
     camera_masks: str = Field(description="JSON string of mask rectangles with normalized coordinates")
+    blank_masked_regions: bool = Field(description="Black out masked regions before detection instead of ignoring faces centred in them")
     mirror_feed: bool = Field(description="Mirror/flip the video feed horizontally")
     kiosk_enabled: bool = Field(description="Enable automatic face recognition")
     recognition_interval_ms: int = Field(description="Milliseconds between recognition attempts")
@@ -58,6 +72,7 @@ class RuntimeSettingsUpdate(BaseModel):
     audio_cooldown_seconds: Optional[float] = None
     camera_fps: Optional[int] = None
     camera_masks: Optional[str] = None
+    blank_masked_regions: Optional[bool] = None
     mirror_feed: Optional[bool] = None
     kiosk_enabled: Optional[bool] = None
     recognition_interval_ms: Optional[int] = None
@@ -76,6 +91,11 @@ def get_config_settings() -> ConfigSettingsResponse:
         camera_width=settings.camera_width,
         camera_height=settings.camera_height,
         use_cuda=settings.use_cuda,
+        use_tensorrt=settings.use_tensorrt,
+        use_int8=settings.use_int8,
+        use_opencl=settings.use_opencl,
+        gallery_int8=settings.gallery_int8,
+        overlay_client_side=settings.overlay_client_side,
         onnx_providers=engine.available_providers,
         active_provider=engine.active_provider,
         cuda_error=engine.cuda_error,
@@ -83,20 +103,19 @@ def get_config_settings() -> ConfigSettingsResponse:
 
 
 def get_runtime_settings() -> RuntimeSettingsResponse:
-    """Get current runtime settings."""
-    rs = runtime_settings_manager.get()
-    return RuntimeSettingsResponse(
-        detection_score_threshold=rs.detection_score_threshold,
-        embedding_distance_threshold=rs.embedding_distance_threshold,
-        upscale_factor=rs.upscale_factor,
-        audio_cooldown_seconds=rs.audio_cooldown_seconds,
-        camera_fps=rs.camera_fps,
-        camera_masks=rs.camera_masks,
-        mirror_feed=rs.mirror_feed,
-        kiosk_enabled=rs.kiosk_enabled,
-        recognition_interval_ms=rs.recognition_interval_ms,
-        low_power_mode=rs.low_power_mode,
-    )
+    """Get current runtime settings.
+    
+    The response is rebuilt only when the settings manager's version changes.
+    """
+    global _runtime_cache
+    
+    # Read the version before the settings so a concurrent update can only
+    # make the cached entry look stale, never fresh
+    version = runtime_settings_manager.version
+    if _runtime_cache[0] != version or _runtime_cache[1] is None:
+        rs = runtime_settings_manager.get()
+        _runtime_cache = (version, RuntimeSettingsResponse(**rs.model_dump()))
+    return _runtime_cache[1]
 
 
 @router.get("", response_model=AllSettingsResponse)
@@ -106,10 +125,22 @@ async def get_settings():
     
     Returns both read-only configuration settings and editable runtime settings.
     """
-    return AllSettingsResponse(
-        config=get_config_settings(),
-        runtime=get_runtime_settings(),
+    global _settings_cache
+    
+    key = (
+        runtime_settings_manager.version,
+        tuple(engine.available_providers),
+        engine.active_provider,
+        engine.cuda_error,
     )
+    if _settings_cache[0] != key:
+        all_settings = AllSettingsResponse(
+            config=get_config_settings(),
+            runtime=get_runtime_settings(),
+        )
+        _settings_cache = (key, all_settings.model_dump_json().encode())
+    
+    return Response(content=_settings_cache[1], media_type="application/json")
 
 
 @router.put("", response_model=RuntimeSettingsResponse)
@@ -1,7 +1,9 @@
 """Application configuration."""
 import json
 import logging
+import os
 import threading
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
@@ -21,6 +23,9 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = False
+    # Origins allowed to call the API cross-origin (JSON list). The bundled
+    # frontend is same-origin, and the Vite dev server proxies /api.
+    allowed_origins: list[str] = ["http://localhost:5173", "http://127.0.0.1:5173"]
     
     # Paths
     data_dir: Path = Path("data")
@@ -30,23 +35,49 @@ class Settings(BaseSettings):
     
     # GPU acceleration
     use_cuda: bool = False
+    # Prefer TensorRT (FP16) over plain CUDA when onnxruntime provides it
+    use_tensorrt: bool = False
+    # Run INT8-quantized models when inference falls back to the CPU
+    use_int8: bool = False
+    # Resize frames for detection on the GPU through OpenCV's OpenCL (T-API)
+    use_opencl: bool = False
+    # Quantize the gallery search index to 8 bits per value (needs faiss)
+    gallery_int8: bool = False
     
     # Camera hardware settings (require restart to change camera)
     camera_device: int = 0
     camera_width: int = 1280
     camera_height: int = 720
+    # Pixel format requested from the camera; MJPG keeps 720p+ within USB 2.0
+    # bandwidth. Empty to use the driver default.
+    camera_fourcc: str = "MJPG"
+    # Capture through a GStreamer pipeline (v4l2src ! jpegdec) instead of V4L2
+    camera_gstreamer: bool = False
+    # Leave face boxes and masks off the kiosk stream; the Live View page
+    # draws them over the video from the WebSocket events instead
+    overlay_client_side: bool = False
     
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         extra = "ignore"  # Ignore extra env vars (e.g., runtime settings in .env)
     
-    @property
+    @cached_property
     def people_dir(self) -> Path:
         """Derived path for people directory."""
         return self.data_dir / "people"
     
-    @property
+    @cached_property
+    def trt_cache_dir(self) -> Path:
+        """Directory for serialized TensorRT engines."""
+        return self.data_dir / "trt_cache"
+    
+    @cached_property
+    def int8_model_root(self) -> Path:
+        """InsightFace model root holding the INT8-quantized model packs."""
+        return self.data_dir / "int8_models"
+    
+    @cached_property
     def runtime_settings_path(self) -> Path:
         """Path to the runtime settings JSON file."""
         return self.data_dir / "runtime_settings.json"
@@ -69,6 +100,7 @@ class RuntimeSettings(BaseModel):
     # Camera runtime settings
     camera_fps: int = 15
     camera_masks: str = ""  # JSON string of mask rectangles
+    blank_masked_regions: bool = False  # Black out masks before detection instead of dropping faces centred in them
     mirror_feed: bool = False  # Mirror/flip the video feed horizontally
     
     # Kiosk behavior
@@ -103,6 +135,12 @@ class RuntimeSettings(BaseModel):
     def skip_upscale_retry(self) -> bool:
         """Whether to skip upscale retry (auto-set based on low_power_mode)."""
         return self.low_power_mode
+    
+    @property
+    def detection_max_side(self) -> int:
+        """Longest side live frames are downscaled to before detection, 0 for none
+        (auto-set based on low_power_mode)."""
+        return 640 if self.low_power_mode else 0
 
 
 class RuntimeSettingsManager:
@@ -114,32 +152,54 @@ class RuntimeSettingsManager:
         self._path = settings_path
         self._settings: RuntimeSettings = RuntimeSettings()
         self._lock = threading.RLock()
+        # Bumped whenever the in-memory settings are replaced
+        self._version = 0
+        # st_mtime_ns of the file as last loaded or saved
+        self._mtime: Optional[int] = None
         self._load()
     
     def _load(self) -> None:
-        """Load settings from JSON file."""
+        """Load settings from JSON file (skipped if the file is unchanged)."""
         with self._lock:
-            if self._path.exists():
+            try:
+                mtime = os.stat(self._path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            
+            if mtime is not None:
+                if mtime == self._mtime:
+                    return
                 try:
                     with open(self._path, "r") as f:
                         data = json.load(f)
                     self._settings = RuntimeSettings(**data)
+                    self._version += 1
                     logger.info("Loaded runtime settings from %s", self._path)
                 except Exception as e:
                     logger.warning("Failed to load runtime settings: %s, using defaults", e)
                     self._settings = RuntimeSettings()
+                    self._version += 1
+                self._mtime = mtime
             else:
                 logger.info("No runtime settings file found, using defaults")
                 self._settings = RuntimeSettings()
+                self._version += 1
                 # Save defaults to create the file
                 self._save_internal()
     
     def _save_internal(self) -> None:
-        """Internal save without lock (caller must hold lock)."""
+        """Internal save without lock (caller must hold lock).
+        
+        Writes to a temp file and renames it over the target so readers never
+        see a partially written file.
+        """
         try:
             self._path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._path, "w") as f:
+            tmp_path = self._path.with_suffix(".json.tmp")
+            with open(tmp_path, "w") as f:
                 json.dump(self._settings.model_dump(), f, indent=2)
+            os.replace(tmp_path, self._path)
+            self._mtime = os.stat(self._path).st_mtime_ns
             logger.info("Saved runtime settings to %s", self._path)
         except Exception as e:
             logger.error("Failed to save runtime settings: %s", e)
@@ -154,21 +214,34 @@ class RuntimeSettingsManager:
         """Save new settings to disk and update in-memory copy."""
         with self._lock:
             self._settings = new_settings
+            self._version += 1
             self._save_internal()
     
     def update(self, **kwargs) -> RuntimeSettings:
         """Update specific settings and save."""
         with self._lock:
             current_dict = self._settings.model_dump()
+            # Nothing changed: skip the disk write and keep the version
+            if all(k in current_dict and current_dict[k] == v for k, v in kwargs.items()):
+                return self._settings
             current_dict.update(kwargs)
             self._settings = RuntimeSettings(**current_dict)
+            self._version += 1
             self._save_internal()
             return self._settings
     
     def get(self) -> RuntimeSettings:
-        """Get current settings (thread-safe read)."""
-        with self._lock:
-            return self._settings
+        """Get current settings.
+        
+        Lock-free: the settings object is replaced wholesale, never mutated,
+        so reading the reference always yields a complete instance.
+        """
+        return self._settings
+    
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the settings are replaced."""
+        return self._version
 
 
 # Global instances
@@ -1,8 +1,13 @@
 """Face detection and recognition using InsightFace."""
 import json
 import logging
+import os
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -12,11 +17,101 @@ from PIL import Image, ImageOps
 
 from .config import settings, get_runtime_settings
 
+try:
+    import faiss
+except ImportError:
+    # Optional: gallery search falls back to simsimd, numba or a numpy matrix product
+    faiss = None
+
+try:
+    import simsimd
+except ImportError:
+    # Optional: SIMD distance kernel used when faiss is not installed
+    simsimd = None
+
+# numba takes a noticeable part of startup to import, so it is only
+# loaded when its kernel would actually be used
+njit = None
+if faiss is None and simsimd is None:
+    try:
+        from numba import njit, prange
+    except ImportError:
+        # Optional: JIT distance kernel used when neither faiss nor simsimd is installed
+        njit = None
+
+# Size of the ArcFace embeddings produced by the InsightFace model packs
+EMBEDDING_DIM = 512
+
+# Only detection and recognition are used; landmark and gender/age models are skipped
+INSIGHTFACE_MODULES = ["detection", "recognition"]
+
+# Square input size of the detector network; a smaller detect_scale shrinks
+# it in steps of the detector's largest stride
+DETECTOR_INPUT_SIZE = 640
+DETECTOR_STRIDE = 32
+
+# Per-photo embeddings cached between runs, stored in the people directory.
+# The npz holds the metadata; the embeddings themselves are a float16 .npy
+# next to it (named in the npz) that is memory-mapped on load.
+GALLERY_CACHE_NAME = ".gallery.npz"
+GALLERY_EMBEDDINGS_GLOB = ".gallery-*.f16.npy"
+
+# A frame whose 32x32 grey thumbnail differs from the last analyzed one by
+# less than STATIC_FRAME_DIFF (mean absolute difference in grey levels)
+# reuses that frame's detections, for at most STATIC_FRAME_MAX_AGE seconds
+STATIC_FRAME_SIZE = (32, 32)
+STATIC_FRAME_DIFF = 2.0
+STATIC_FRAME_MAX_AGE = 1.0
+
+# Haar cascade used as a cheap check for faces before the upscaling retry.
+# Shipped with opencv-python; None when the build lacks it, in which case
+# the retry always runs.
+_cascade_dir = getattr(getattr(cv2, "data", None), "haarcascades", None)
+HAAR_CASCADE_PATH = (
+    Path(_cascade_dir) / "haarcascade_frontalface_default.xml"
+    if _cascade_dir and hasattr(cv2, "CascadeClassifier")
+    else None
+)
+# Longest side of the greyscale frame the cascade scans
+HAAR_MAX_SIDE = 640
+
+# File types recognised in a person's directory; audio in theme preference order
+IMAGE_EXTENSIONS = frozenset({".jpeg", ".jpg", ".png"})
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a")
+
+# Threads used to process gallery photos at startup. ONNX Runtime already
+# runs each inference multi-threaded, so more workers than this only
+# oversubscribe the CPU.
+GALLERY_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+# On CPU every inference already uses all cores; a second worker only keeps
+# image decoding overlapped with inference
+CPU_GALLERY_LOAD_WORKERS = min(2, GALLERY_LOAD_WORKERS)
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _batch_cosine_distance(gallery, queries, out):
+        """Cosine distances between unit-norm queries (M, D) and gallery rows (N, D).
+        
+        Writes the (M, N) result into out.
+        """
+        for i in prange(gallery.shape[0]):
+            for j in range(queries.shape[0]):
+                s = 0.0
+                for k in range(gallery.shape[1]):
+                    s += gallery[i, k] * queries[j, k]
+                out[j, i] = 1.0 - s
+else:
+    _batch_cosine_distance = None
+
 
+@lru_cache(maxsize=4)
 def parse_camera_masks(masks_json: str) -> list[dict]:
     """Parse camera masks from JSON string.
     
     Returns list of mask dicts with x, y, width, height as normalized coordinates (0-1).
+    Results are cached per string, so the returned list is shared and must
+    not be modified.
     """
     if not masks_json or not masks_json.strip():
         return []
@@ -34,23 +129,23 @@ def parse_camera_masks(masks_json: str) -> list[dict]:
         return []
 
 
-def apply_masks_to_image(image_bgr: np.ndarray, masks: list[dict]) -> np.ndarray:
-    """Apply masks to an image by setting masked regions to black.
+# (masks, height, width, rects) of the last _mask_pixel_rects call
+_mask_rects_cache: Optional[tuple[list[dict], int, int, list[tuple[int, int, int, int]]]] = None
+
+
+def _mask_pixel_rects(masks: list[dict], h: int, w: int) -> list[tuple[int, int, int, int]]:
+    """Convert normalized masks to clamped (x1, y1, x2, y2) pixel rects.
     
-    Args:
-        image_bgr: BGR image as numpy array
-        masks: List of mask dicts with normalized coordinates (0-1)
-        
-    Returns:
-        Copy of image with masked regions blacked out
+    Empty rects are dropped. The result for the last masks list (compared
+    by identity, which holds for the cached parse_camera_masks output) and
+    frame size is reused.
     """
-    if not masks:
-        return image_bgr
-    
-    # Create a copy to avoid modifying the original
-    result = image_bgr.copy()
-    h, w = result.shape[:2]
+    global _mask_rects_cache
+    cached = _mask_rects_cache
+    if cached is not None and cached[0] is masks and cached[1] == h and cached[2] == w:
+        return cached[3]
     
+    rects = []
     for mask in masks:
         # Convert normalized coordinates to pixel coordinates
         x = int(mask['x'] * w)
@@ -64,34 +159,139 @@ def apply_masks_to_image(image_bgr: np.ndarray, masks: list[dict]) -> np.ndarray
         x2 = min(w, x + mask_w)
         y2 = min(h, y + mask_h)
         
-        # Black out the masked region
         if x2 > x1 and y2 > y1:
-            result[y1:y2, x1:x2] = 0
+            rects.append((x1, y1, x2, y2))
+    
+    _mask_rects_cache = (masks, h, w, rects)
+    return rects
+
+
+def _center_in_rects(x: int, y: int, width: int, height: int, rects: list[tuple[int, int, int, int]]) -> bool:
+    """Whether the centre of a box lies inside any of the pixel rects."""
+    cx = x + width / 2
+    cy = y + height / 2
+    for x1, y1, x2, y2 in rects:
+        if x1 <= cx < x2 and y1 <= cy < y2:
+            return True
+    return False
+
+
+def apply_masks_to_image(
+    image_bgr: np.ndarray,
+    masks: list[dict],
+    out: Optional[np.ndarray] = None,
+    inplace: bool = False,
+) -> np.ndarray:
+    """Apply masks to an image by setting masked regions to black.
+    
+    Args:
+        image_bgr: BGR image as numpy array
+        masks: List of mask dicts with normalized coordinates (0-1)
+        out: Optional preallocated array of the same shape and dtype to
+             write the result into instead of allocating a copy
+        inplace: Black out regions directly in image_bgr (no copy)
+        
+    Returns:
+        Image with masked regions blacked out. This is image_bgr itself when
+        inplace is set or no mask overlaps the image, otherwise a copy.
+    """
+    if not masks:
+        return image_bgr
+    
+    h, w = image_bgr.shape[:2]
+    rects = _mask_pixel_rects(masks, h, w)
+    
+    if not rects:
+        return image_bgr
+    
+    # Copy unless allowed to modify the original
+    if inplace:
+        result = image_bgr
+    elif out is not None:
+        np.copyto(out, image_bgr)
+        result = out
+    else:
+        result = image_bgr.copy()
+    
+    # Black out the masked regions
+    for x1, y1, x2, y2 in rects:
+        result[y1:y2, x1:x2] = 0
     
     return result
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     """Represents a known person with their embeddings and audio state."""
     name: str
-    embeddings: list[np.ndarray] = field(default_factory=list)
+    # (k, EMBEDDING_DIM) float16, one row per photo with a detected face
+    embeddings: np.ndarray = field(
+        default_factory=lambda: np.empty((0, EMBEDDING_DIM), dtype=np.float16)
+    )
     theme_path: Optional[Path] = None
     photo_paths: list[Path] = field(default_factory=list)
+    # Photo each embeddings row came from (photos without a face have no row)
+    embedding_paths: list[Path] = field(default_factory=list)
     preview_photo_id: Optional[str] = None
     last_seen: float = 0.0
     last_played: float = 0.0
+    # Derived API fields, cleared whenever photos/theme/preview change
+    _summary: Optional[dict] = field(default=None, repr=False, compare=False)
 
-    def add_embedding(self, embedding: np.ndarray) -> None:
-        """Add a new embedding for this person."""
-        self.embeddings.append(embedding)
+    def add_embedding(self, embedding: np.ndarray, photo_path: Path) -> None:
+        """Add the embedding of a photo for this person, normalized to unit length.
+        
+        Matching scores by plain inner product, so every stored row must be
+        unit norm (rows restored from the float16 cache are only close to it).
+        Rows are stored as float16, which keeps cosine scores within ~1e-3.
+        """
+        row = np.asarray(embedding, dtype=np.float32)
+        row = row / (np.linalg.norm(row) + 1e-8)
+        self.embeddings = np.vstack([self.embeddings, row.astype(np.float16)[None, :]])
+        self.embedding_paths.append(photo_path)
+        self._summary = None
+
+    def remove_embedding(self, idx: int) -> None:
+        """Remove the embedding at the given row."""
+        self.embeddings = np.delete(self.embeddings, idx, axis=0)
+        del self.embedding_paths[idx]
+        self._summary = None
 
     def has_theme(self) -> bool:
         """Check if this person has a theme audio file."""
         return self.theme_path is not None
 
+    def preview_url(self) -> Optional[str]:
+        """Get the URL of this person's preview photo."""
+        # Use explicit preview if set
+        if self.preview_photo_id:
+            return f"/api/people/{self.name}/photos/{self.preview_photo_id}/file"
+        
+        # Fall back to first photo
+        if self.photo_paths:
+            return f"/api/people/{self.name}/photos/{self.photo_paths[0].name}/file"
+        
+        return None
+
+    def summary(self) -> dict:
+        """Get the fields exposed by the people API (cached)."""
+        if self._summary is None:
+            self._summary = {
+                "name": self.name,
+                "photo_count": len(self.photo_paths),
+                "embedding_count": len(self.embeddings),
+                "has_theme": self.has_theme(),
+                "theme_filename": self.theme_path.name if self.theme_path else None,
+                "preview_url": self.preview_url(),
+            }
+        return self._summary
+
+    def invalidate_summary(self) -> None:
+        """Drop cached API fields after photos, theme or preview change."""
+        self._summary = None
+
     def should_play_theme(self, now: float) -> bool:
         """Check if theme should play based on cooldown rules."""
         if not self.has_theme():
@@ -109,7 +309,7 @@ class Person:
         self.last_played = now
 
 
-@dataclass
+@dataclass(slots=True)
 class FaceDetection:
     """A detected face with its embedding."""
     x: int
@@ -120,16 +320,96 @@ class FaceDetection:
     embedding: np.ndarray
 
 
+@lru_cache(maxsize=1)
+def _onnx_providers() -> tuple[str, ...]:
+    """ONNX Runtime execution providers available in this process.
+    
+    Lazy import: onnxruntime-gpu can crash at import time if CUDA libs are
+    missing. By importing here instead of at module level, the app can
+    still start and show the error in the web UI. Failures are not cached.
+    """
+    import onnxruntime
+    return tuple(onnxruntime.get_available_providers())
+
+
+class FrameContext:
+    """Buffers reused from one recognition call to the next.
+    
+    Each thread gets its own context since recognition can run concurrently
+    from the kiosk loop and the API.
+    """
+
+    def __init__(self):
+        self._images: dict[str, np.ndarray] = {}
+        self._blocks: dict[str, np.ndarray] = {}
+        self._cascade: Optional["cv2.CascadeClassifier"] = None
+
+    def image(self, name: str, shape: tuple[int, ...]) -> np.ndarray:
+        """Return a uint8 image buffer, reallocated only when the shape changes."""
+        buf = self._images.get(name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            self._images[name] = buf
+        return buf
+
+    def rows(self, name: str, count: int, width: int) -> np.ndarray:
+        """Return a (count, width) float32 view of a block that only ever grows."""
+        block = self._blocks.get(name)
+        if block is None or block.shape[1] != width or block.shape[0] < count:
+            capacity = max(count, 2 * block.shape[0] if block is not None else 4)
+            block = np.empty((capacity, width), dtype=np.float32)
+            self._blocks[name] = block
+        return block[:count]
+
+    def face_cascade(self) -> Optional["cv2.CascadeClassifier"]:
+        """This thread's Haar face cascade, or None if it is not available.
+        
+        Cascades are not safe to share between threads, hence one per context.
+        """
+        if self._cascade is None and HAAR_CASCADE_PATH is not None and HAAR_CASCADE_PATH.exists():
+            cascade = cv2.CascadeClassifier(str(HAAR_CASCADE_PATH))
+            if not cascade.empty():
+                self._cascade = cascade
+        return self._cascade
+
+
 class FaceRecognitionEngine:
     """Face detection and recognition engine using InsightFace."""
 
     def __init__(self):
         self._detector = None
+        self._norm_crop = None
         self._people: dict[str, Person] = {}
         self._initialized = False
+        # Set once load_gallery() has run (the server starts before that)
+        self._gallery_loaded = False
+        # Set while startup initializes the engine and loads the gallery
+        self._warming_up = False
         self._cuda_error: Optional[str] = None
         self._available_providers: list[str] = []
         self._active_provider: Optional[str] = None
+        # Bumped on any change visible through the people API
+        self._people_version = 0
+        # Flattened gallery for vectorized matching: an (N, EMBEDDING_DIM)
+        # matrix of every embedding (see _gallery_dtype), the owning name of
+        # each row and a FAISS inner-product index over the matrix (when
+        # faiss is installed). Replaced as a single tuple so readers on other
+        # threads see a consistent snapshot.
+        self._gallery: tuple[np.ndarray, list[str], Optional["faiss.Index"]] = (
+            np.empty((0, EMBEDDING_DIM), dtype=self._gallery_dtype()),
+            [],
+            None,
+        )
+        # Photo path (relative to people_dir) -> (mtime_ns, embedding or None
+        # when no face was found); persisted to GALLERY_CACHE_NAME
+        self._photo_embeddings: dict[str, tuple[int, Optional[np.ndarray]]] = {}
+        # Per-thread FrameContext, see _context()
+        self._contexts = threading.local()
+        # Last fully analyzed frame for recognize_frame(skip_static=True):
+        # (thumbnail, analyzed at, frame shape, masks, detections)
+        self._static_frame: Optional[tuple] = None
+        # Detection resizes go through OpenCL UMats (settings.use_opencl)
+        self._use_opencl = False
 
     def initialize(self) -> None:
         """Initialize the InsightFace detector.
@@ -139,16 +419,16 @@ class FaceRecognitionEngine:
         
         If use_cuda is enabled but CUDAExecutionProvider is not available,
         sets a CUDA error and does not initialize the detector.
+        
+        Meant to be called once at startup; later calls return immediately
+        once initialized, and the provider query is only done once per
+        process.
         """
         if self._initialized:
             return
         
-        # Lazy import: onnxruntime-gpu can crash at import time if CUDA libs
-        # are missing. By importing here instead of at module level, the app
-        # can still start and show the error in the web UI.
         try:
-            import onnxruntime
-            self._available_providers = onnxruntime.get_available_providers()
+            self._available_providers = list(_onnx_providers())
             logger.info("Available ONNX providers: %s", self._available_providers)
         except Exception as exc:
             self._cuda_error = (
@@ -171,6 +451,7 @@ class FaceRecognitionEngine:
         
         try:
             from insightface.app import FaceAnalysis
+            from insightface.utils.face_align import norm_crop
         except Exception as exc:
             self._cuda_error = (
                 f"Failed to import insightface: {exc}. "
@@ -192,16 +473,134 @@ class FaceRecognitionEngine:
             else:
                 logger.info("Using CPU (CUDA not available)")
         
-        self._detector = FaceAnalysis(name=settings.insightface_model)
-        self._detector.prepare(ctx_id=0 if cuda_available and settings.use_cuda else -1, det_size=(640, 640))
+        use_gpu = settings.use_cuda and cuda_available
+        ctx_id = 0 if use_gpu else -1
+        detector = None
+        if use_gpu and settings.use_tensorrt:
+            if "TensorrtExecutionProvider" in self._available_providers:
+                try:
+                    detector = FaceAnalysis(
+                        name=settings.insightface_model,
+                        providers=self._tensorrt_providers(),
+                        allowed_modules=INSIGHTFACE_MODULES,
+                    )
+                    detector.prepare(ctx_id=ctx_id, det_size=(DETECTOR_INPUT_SIZE, DETECTOR_INPUT_SIZE))
+                    self._active_provider = "TensorrtExecutionProvider"
+                    logger.info("Using TensorRT (FP16)")
+                except Exception as exc:
+                    detector = None
+                    logger.warning("TensorRT initialization failed, falling back to CUDA: %s", exc)
+            else:
+                logger.warning("USE_TENSORRT is set but TensorrtExecutionProvider is not available")
+        
+        if detector is None:
+            providers = ["CUDAExecutionProvider", "CPUExecutionProvider"] if use_gpu else ["CPUExecutionProvider"]
+            kwargs = {}
+            if not use_gpu and settings.use_int8:
+                int8_root = self._prepare_int8_models()
+                if int8_root is not None:
+                    kwargs["root"] = str(int8_root)
+                    logger.info("Using INT8-quantized models from %s", int8_root)
+            detector = FaceAnalysis(
+                name=settings.insightface_model,
+                providers=providers,
+                allowed_modules=INSIGHTFACE_MODULES,
+                **kwargs,
+            )
+            detector.prepare(ctx_id=ctx_id, det_size=(DETECTOR_INPUT_SIZE, DETECTOR_INPUT_SIZE))
+        
+        self._detector = detector
+        self._norm_crop = norm_crop
         self._initialized = True
         self._cuda_error = None
         logger.info("InsightFace detector initialized with %s", self._active_provider)
 
+        if settings.use_opencl:
+            if cv2.ocl.haveOpenCL():
+                cv2.ocl.setUseOpenCL(True)
+                self._use_opencl = True
+                logger.info("Resizing detection frames through OpenCL")
+            else:
+                logger.warning("USE_OPENCL is set but OpenCV has no OpenCL device")
+
+        if faiss is None and simsimd is None and _batch_cosine_distance is not None:
+            # Compile the distance kernel now rather than on the first match
+            _batch_cosine_distance(
+                np.zeros((1, EMBEDDING_DIM), dtype=np.float32),
+                np.zeros((1, EMBEDDING_DIM), dtype=np.float32),
+                np.empty((1, 1), dtype=np.float32),
+            )
+
+    @staticmethod
+    def _tensorrt_providers() -> list:
+        """ONNX Runtime provider list preferring TensorRT with FP16.
+        
+        Built engines are cached on disk (one per model and input shape), so
+        only the first start pays the TensorRT build time.
+        """
+        settings.trt_cache_dir.mkdir(parents=True, exist_ok=True)
+        return [
+            (
+                "TensorrtExecutionProvider",
+                {
+                    "trt_fp16_enable": True,
+                    "trt_engine_cache_enable": True,
+                    "trt_engine_cache_path": str(settings.trt_cache_dir),
+                },
+            ),
+            "CUDAExecutionProvider",
+            "CPUExecutionProvider",
+        ]
+
+    @staticmethod
+    def _prepare_int8_models() -> Optional[Path]:
+        """Quantize the InsightFace model pack to INT8 for CPU inference.
+        
+        Uses ONNX Runtime dynamic quantization (int8 weights) and writes the
+        result under settings.int8_model_root, laid out like the regular
+        InsightFace model root. Models that are already quantized are reused,
+        so the work is only done on the first start. Returns the model root,
+        or None if quantization failed and the FP32 models should be used.
+        """
+        try:
+            from insightface.utils import ensure_available
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            source_dir = Path(ensure_available("models", settings.insightface_model))
+            target_dir = settings.int8_model_root / "models" / settings.insightface_model
+            target_dir.mkdir(parents=True, exist_ok=True)
+
+            for source in sorted(source_dir.glob("*.onnx")):
+                target = target_dir / source.name
+                if target.exists():
+                    continue
+                logger.info("Quantizing %s to INT8", source.name)
+                temp = target.with_name(target.name + ".tmp")
+                quantize_dynamic(str(source), str(temp), weight_type=QuantType.QInt8)
+                os.replace(temp, target)
+        except Exception as exc:
+            logger.warning("INT8 quantization failed, using FP32 models: %s", exc)
+            return None
+        return settings.int8_model_root
+
     @property
     def is_initialized(self) -> bool:
         return self._initialized
 
+    @property
+    def is_ready(self) -> bool:
+        """Whether the models are loaded and the gallery has been read from disk."""
+        return self._initialized and self._gallery_loaded
+
+    @property
+    def warming_up(self) -> bool:
+        """Whether startup is still initializing the engine and loading the gallery."""
+        return self._warming_up
+
+    @warming_up.setter
+    def warming_up(self, value: bool) -> None:
+        self._warming_up = value
+
     @property
     def cuda_error(self) -> Optional[str]:
         """Returns CUDA error message if use_cuda is set but CUDA is unavailable."""
@@ -221,49 +620,296 @@ class FaceRecognitionEngine:
     def people(self) -> dict[str, Person]:
         return self._people
 
+    @property
+    def people_count(self) -> int:
+        """Number of people in the gallery."""
+        return len(self._people)
+
+    @property
+    def people_version(self) -> int:
+        """Counter that changes whenever people, photos or themes change."""
+        return self._people_version
+
+    def _rebuild_gallery(self) -> None:
+        """Rebuild the flattened embedding matrix used by match_face."""
+        rows = []
+        names = []
+        for person in self._people.values():
+            if len(person.embeddings):
+                rows.append(person.embeddings)
+                names.extend([person.name] * len(person.embeddings))
+        
+        if rows:
+            matrix = np.ascontiguousarray(np.vstack(rows), dtype=self._gallery_dtype())
+        else:
+            matrix = np.empty((0, EMBEDDING_DIM), dtype=self._gallery_dtype())
+        self._gallery = (matrix, names, self._build_gallery_index(matrix))
+
+    def _append_to_gallery(self, name: str, embedding: np.ndarray) -> None:
+        """Add one embedding row to the gallery without walking all people."""
+        matrix, names, _ = self._gallery
+        matrix = np.vstack([matrix, np.asarray(embedding, dtype=self._gallery_dtype())[None, :]])
+        names = names + [name]
+        # The snapshot is immutable, so the index is rebuilt rather than
+        # extended in place under a concurrent search
+        self._gallery = (matrix, names, self._build_gallery_index(matrix))
+
+    def _drop_gallery_rows(self, keep: np.ndarray) -> None:
+        """Remove the gallery rows where keep is False without walking all people."""
+        matrix, names, _ = self._gallery
+        matrix = matrix[keep]
+        names = [name for name, kept in zip(names, keep.tolist()) if kept]
+        self._gallery = (matrix, names, self._build_gallery_index(matrix))
+
+    def _remove_person_from_gallery(self, name: str, idx: Optional[int] = None) -> None:
+        """Drop a person's gallery rows, or only their embedding at idx.
+        
+        A person's rows keep their order in the gallery (appends go to the
+        end of both), so embedding idx is the idx-th row owned by the person.
+        """
+        names = self._gallery[1]
+        owned = np.fromiter((n == name for n in names), dtype=bool, count=len(names))
+        if idx is None:
+            keep = ~owned
+        else:
+            keep = np.ones(len(names), dtype=bool)
+            keep[np.flatnonzero(owned)[idx]] = False
+        self._drop_gallery_rows(keep)
+
+    @staticmethod
+    def _gallery_dtype() -> type:
+        """Storage type of the gallery matrix.
+        
+        With faiss the matrix is only kept to (re)build the float16 index,
+        so it is stored as float16 too. The numba and numpy fallbacks scan
+        the matrix directly and need float32, as BLAS has no half-precision
+        path.
+        """
+        return np.float16 if faiss is not None else np.float32
+
+    @staticmethod
+    def _build_gallery_index(matrix: np.ndarray) -> Optional["faiss.Index"]:
+        """FAISS index over the gallery matrix, or None without faiss.
+        
+        Inner product over unit vectors is cosine similarity. The index
+        stores the vectors as float16, halving the bytes scanned per
+        search; on unit vectors this moves distances by ~1e-4. With
+        settings.gallery_int8 it stores one byte per value instead, on a
+        single range trained from the whole gallery (retrained on every
+        rebuild), for ~1e-3 distance error.
+        """
+        if faiss is None or not len(matrix):
+            return None
+        vectors = np.ascontiguousarray(matrix, dtype=np.float32)
+        if settings.gallery_int8:
+            index = faiss.IndexScalarQuantizer(
+                vectors.shape[1], faiss.ScalarQuantizer.QT_8bit_uniform, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(vectors)
+        else:
+            index = faiss.IndexScalarQuantizer(
+                vectors.shape[1], faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+            )
+        index.add(vectors)
+        return index
+
+    def _context(self) -> FrameContext:
+        """Return the calling thread's FrameContext."""
+        ctx = getattr(self._contexts, "ctx", None)
+        if ctx is None:
+            ctx = self._contexts.ctx = FrameContext()
+        return ctx
+
+    def _person_changed(self, person: Person) -> None:
+        """Invalidate cached API data after a person was modified."""
+        person.invalidate_summary()
+        self._people_version += 1
+
+    @staticmethod
+    def _photo_key(photo_path: Path) -> str:
+        """Key of a photo in the embedding cache."""
+        return photo_path.relative_to(settings.people_dir).as_posix()
+
+    def _load_gallery_cache(self) -> dict[str, tuple[int, Optional[np.ndarray]]]:
+        """Read cached photo embeddings from disk.
+        
+        The embedding rows are read-only views into a memory-mapped float16
+        file, so only rows of photos that are still present get paged in.
+        Returns an empty dict if the cache is missing, unreadable or was
+        written for a different model pack.
+        """
+        cache_path = settings.people_dir / GALLERY_CACHE_NAME
+        if not cache_path.exists():
+            return {}
+        try:
+            with np.load(cache_path, allow_pickle=False) as data:
+                if str(data["model"]) != settings.insightface_model:
+                    logger.info("Gallery cache was built with another model, ignoring it")
+                    return {}
+                paths = data["paths"].tolist()
+                mtimes = data["mtimes"].tolist()
+                has_face = data["has_face"].tolist()
+                embeddings_file = str(data["embeddings_file"])
+            embeddings = np.load(
+                settings.people_dir / embeddings_file, mmap_mode="r", allow_pickle=False
+            )
+            if embeddings.shape != (len(paths), EMBEDDING_DIM):
+                raise ValueError(f"unexpected embeddings shape {embeddings.shape}")
+        except Exception as exc:
+            logger.warning("Failed to read gallery cache %s: %s", cache_path, exc)
+            return {}
+
+        return {
+            path: (mtime, embeddings[i] if found else None)
+            for i, (path, mtime, found) in enumerate(zip(paths, mtimes, has_face))
+        }
+
+    def _save_gallery_cache(self) -> None:
+        """Write the photo embedding cache to disk."""
+        if not settings.people_dir.exists():
+            return
+
+        entries = sorted(self._photo_embeddings.items())
+        embeddings = np.zeros((len(entries), EMBEDDING_DIM), dtype=np.float16)
+        for i, (_, (_, embedding)) in enumerate(entries):
+            if embedding is not None:
+                embeddings[i] = embedding
+
+        cache_path = settings.people_dir / GALLERY_CACHE_NAME
+        # Each save writes a new uniquely named embeddings file that the
+        # metadata then points to, so a crash never pairs metadata with the
+        # wrong rows and readers keep a valid mapping of the old file.
+        embeddings_file = GALLERY_EMBEDDINGS_GLOB.replace("*", uuid.uuid4().hex[:12])
+        # Suffix must stay .npz or np.savez appends it to the temp name
+        temp_path = cache_path.with_name(".gallery.tmp.npz")
+        try:
+            np.save(settings.people_dir / embeddings_file, embeddings)
+            np.savez(
+                temp_path,
+                model=np.array(settings.insightface_model),
+                paths=np.array([path for path, _ in entries], dtype=str),
+                mtimes=np.array([mtime for _, (mtime, _) in entries], dtype=np.int64),
+                has_face=np.array([e is not None for _, (_, e) in entries], dtype=bool),
+                embeddings_file=np.array(embeddings_file),
+            )
+            os.replace(temp_path, cache_path)
+        except Exception as exc:
+            logger.warning("Failed to write gallery cache: %s", exc)
+            return
+
+        for old in settings.people_dir.glob(GALLERY_EMBEDDINGS_GLOB):
+            if old.name != embeddings_file:
+                old.unlink(missing_ok=True)
+
+    def _compute_photo_embedding(self, photo_path: Path) -> Optional[np.ndarray]:
+        """Detect faces in a photo and return the largest face's embedding."""
+        image_bgr = self._load_image_with_exif(photo_path)
+        detections = self._detect_with_retry(image_bgr)
+        if not detections:
+            return None
+        # Use the largest detected face
+        areas = np.fromiter(
+            (d.width * d.height for d in detections), dtype=np.int64, count=len(detections)
+        )
+        return detections[int(areas.argmax())].embedding
+
+    def _load_photo_embedding(
+        self,
+        img_path: Path,
+        cached: dict[str, tuple[int, Optional[np.ndarray]]],
+    ) -> Optional[tuple[str, int, Optional[np.ndarray], bool]]:
+        """Embedding of a gallery photo, from the cache if the file is unchanged.
+        
+        Returns (cache key, mtime_ns, embedding or None, from_cache), or None
+        if the photo could not be processed.
+        """
+        try:
+            key = self._photo_key(img_path)
+            mtime = img_path.stat().st_mtime_ns
+            entry = cached.get(key)
+            if entry is not None and entry[0] == mtime:
+                return key, mtime, entry[1], True
+            return key, mtime, self._compute_photo_embedding(img_path), False
+        except Exception as exc:
+            logger.warning("Failed to process %s: %s", img_path, exc)
+            return None
+
     def load_gallery(self) -> None:
-        """Load the people gallery from disk."""
-        self._people.clear()
+        """Load the people gallery from disk.
         
+        Embeddings of photos unchanged since the last run are taken from
+        the on-disk cache; only new or modified photos go through detection.
+        The new people and embeddings are built up separately and swapped in
+        at the end, so readers never see a partially loaded gallery.
+        """
         if not settings.people_dir.exists():
             logger.warning("People directory does not exist: %s", settings.people_dir)
+            self._people = {}
+            self._people_version += 1
+            self._rebuild_gallery()
+            self._gallery_loaded = True
             return
 
-        for person_dir in sorted(settings.people_dir.iterdir()):
-            if not person_dir.is_dir():
-                continue
-            
+        cached = self._load_gallery_cache()
+        loaded_people: dict[str, Person] = {}
+        photo_embeddings: dict[str, tuple[int, Optional[np.ndarray]]] = {}
+        reused = 0
+        people: list[tuple[Person, list[Path]]] = []
+
+        with os.scandir(settings.people_dir) as entries:
+            person_dirs = sorted(Path(entry.path) for entry in entries if entry.is_dir())
+
+        for person_dir in person_dirs:
             person_name = person_dir.name
-            theme_path = self._find_theme_file(person_dir)
+            image_paths, theme_path = self._scan_person_dir(person_dir)
             preview_photo_id = self._load_preview_id(person_dir)
             person = Person(name=person_name, theme_path=theme_path, preview_photo_id=preview_photo_id)
 
             if theme_path:
                 logger.info("Found theme for %s: %s", person_name, theme_path.name)
 
-            # Find and process all photos
-            image_paths = self._get_image_paths(person_dir)
             if not image_paths:
                 logger.warning("No images found for %s", person_name)
                 continue
+            people.append((person, image_paths))
+
+        # Process all photos in parallel; OpenCV decoding and ONNX Runtime
+        # inference release the GIL. Results are merged below in order.
+        all_paths = [img_path for _, image_paths in people for img_path in image_paths]
+        workers = (
+            CPU_GALLERY_LOAD_WORKERS
+            if self._active_provider == "CPUExecutionProvider"
+            else GALLERY_LOAD_WORKERS
+        )
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = iter(list(pool.map(lambda path: self._load_photo_embedding(path, cached), all_paths)))
 
+        for person, image_paths in people:
             for img_path in image_paths:
                 person.photo_paths.append(img_path)
-                try:
-                    image_bgr = self._load_image_with_exif(img_path)
-                    detections = self._detect_with_retry(image_bgr)
-                    if detections:
-                        # Use the largest detected face
-                        largest = max(detections, key=lambda d: d.width * d.height)
-                        person.add_embedding(largest.embedding)
-                        logger.info("Added embedding for %s from %s", person_name, img_path.name)
-                except Exception as exc:
-                    logger.warning("Failed to process %s: %s", img_path, exc)
-
-            if person.embeddings:
-                self._people[person_name] = person
-
-        logger.info("Loaded %d people with embeddings", len(self._people))
+                result = next(results)
+                if result is None:
+                    continue
+                key, mtime, embedding, from_cache = result
+                reused += from_cache
+                photo_embeddings[key] = (mtime, embedding)
+                if embedding is not None:
+                    person.add_embedding(embedding, img_path)
+                    logger.info("Added embedding for %s from %s", person.name, img_path.name)
+
+            if len(person.embeddings):
+                loaded_people[person.name] = person
+
+        self._people = loaded_people
+        self._photo_embeddings = photo_embeddings
+        self._people_version += 1
+        self._rebuild_gallery()
+        self._save_gallery_cache()
+        self._gallery_loaded = True
+        logger.info(
+            "Loaded %d people with embeddings (%d of %d photos from cache)",
+            len(self._people), reused, len(self._photo_embeddings),
+        )
 
     def add_person(self, name: str) -> Person:
         """Add a new person to the gallery."""
@@ -272,6 +918,7 @@ class FaceRecognitionEngine:
         
         person = Person(name=name)
         self._people[name] = person
+        self._people_version += 1
         return person
 
     def delete_person(self, name: str) -> bool:
@@ -285,6 +932,13 @@ class FaceRecognitionEngine:
             shutil.rmtree(person_dir)
         
         del self._people[name]
+        self._people_version += 1
+        self._remove_person_from_gallery(name)
+
+        prefix = f"{name}/"
+        for key in [k for k in self._photo_embeddings if k.startswith(prefix)]:
+            del self._photo_embeddings[key]
+        self._save_gallery_cache()
         return True
 
     def add_photo(self, person_name: str, image_data: bytes, filename: str) -> Optional[Path]:
@@ -292,7 +946,6 @@ class FaceRecognitionEngine:
         if person_name not in self._people:
             return None
 
-        person = self._people[person_name]
         person_dir = settings.people_dir / person_name
         person_dir.mkdir(parents=True, exist_ok=True)
 
@@ -301,15 +954,40 @@ class FaceRecognitionEngine:
         with open(photo_path, "wb") as f:
             f.write(image_data)
 
-        # Compute embedding
+        return self._register_photo(person_name, photo_path)
+
+    def add_photo_from_path(self, person_name: str, source_path: Path, filename: str) -> Optional[Path]:
+        """Add a photo already written to disk (e.g. a streamed upload).
+        
+        The source file is moved into the person's directory, so it should
+        live on the same filesystem (ideally in that directory already).
+        """
+        if person_name not in self._people:
+            return None
+
+        person_dir = settings.people_dir / person_name
+        person_dir.mkdir(parents=True, exist_ok=True)
+
+        photo_path = person_dir / filename
+        os.replace(source_path, photo_path)
+
+        return self._register_photo(person_name, photo_path)
+
+    def _register_photo(self, person_name: str, photo_path: Path) -> Optional[Path]:
+        """Compute the embedding for a saved photo, removing it if no face is found."""
+        person = self._people[person_name]
         try:
-            image_bgr = self._load_image_with_exif(photo_path)
-            detections = self._detect_with_retry(image_bgr)
-            if detections:
-                largest = max(detections, key=lambda d: d.width * d.height)
-                person.add_embedding(largest.embedding)
+            embedding = self._compute_photo_embedding(photo_path)
+            if embedding is not None:
+                person.add_embedding(embedding, photo_path)
                 person.photo_paths.append(photo_path)
-                logger.info("Added photo and embedding for %s: %s", person_name, filename)
+                self._person_changed(person)
+                self._append_to_gallery(person_name, embedding)
+                self._photo_embeddings[self._photo_key(photo_path)] = (
+                    photo_path.stat().st_mtime_ns, embedding,
+                )
+                self._save_gallery_cache()
+                logger.info("Added photo and embedding for %s: %s", person_name, photo_path.name)
                 return photo_path
             else:
                 # No face detected, remove the file
@@ -331,18 +1009,19 @@ class FaceRecognitionEngine:
         photo_path = settings.people_dir / person_name / photo_id
         
         if photo_path.exists():
-            # Find the index of this photo
-            try:
-                idx = person.photo_paths.index(photo_path)
-                person.photo_paths.pop(idx)
-                if idx < len(person.embeddings):
-                    person.embeddings.pop(idx)
-                photo_path.unlink()
-                return True
-            except ValueError:
-                # Photo not in list, just delete file
-                photo_path.unlink()
-                return True
+            if photo_path in person.photo_paths:
+                person.photo_paths.remove(photo_path)
+                # Photos without a detected face have no embedding row, so
+                # the row is looked up by path rather than photo position
+                if photo_path in person.embedding_paths:
+                    row = person.embedding_paths.index(photo_path)
+                    person.remove_embedding(row)
+                    self._remove_person_from_gallery(person_name, row)
+                self._person_changed(person)
+            photo_path.unlink()
+            if self._photo_embeddings.pop(self._photo_key(photo_path), None) is not None:
+                self._save_gallery_cache()
+            return True
         return False
 
     def set_theme(self, person_name: str, audio_data: bytes, filename: str) -> Optional[Path]:
@@ -364,6 +1043,31 @@ class FaceRecognitionEngine:
             f.write(audio_data)
 
         person.theme_path = theme_path
+        self._person_changed(person)
+        logger.info("Set theme for %s: %s", person_name, filename)
+        return theme_path
+
+    def set_theme_from_path(self, person_name: str, source_path: Path, filename: str) -> Optional[Path]:
+        """Set the theme song for a person from a file already on disk.
+        
+        The source file is moved into place rather than copied.
+        """
+        if person_name not in self._people:
+            return None
+
+        person = self._people[person_name]
+        person_dir = settings.people_dir / person_name
+        person_dir.mkdir(parents=True, exist_ok=True)
+
+        # Remove existing theme
+        if person.theme_path and person.theme_path.exists():
+            person.theme_path.unlink()
+
+        theme_path = person_dir / filename
+        os.replace(source_path, theme_path)
+
+        person.theme_path = theme_path
+        self._person_changed(person)
         logger.info("Set theme for %s: %s", person_name, filename)
         return theme_path
 
@@ -376,6 +1080,7 @@ class FaceRecognitionEngine:
         if person.theme_path and person.theme_path.exists():
             person.theme_path.unlink()
             person.theme_path = None
+            self._person_changed(person)
             return True
         return False
 
@@ -397,6 +1102,7 @@ class FaceRecognitionEngine:
         preview_file.write_text(photo_id)
         
         person.preview_photo_id = photo_id
+        self._person_changed(person)
         logger.info("Set preview photo for %s: %s", person_name, photo_id)
         return True
 
@@ -405,63 +1111,125 @@ class FaceRecognitionEngine:
         if person_name not in self._people:
             return None
         
-        person = self._people[person_name]
-        
-        # Use explicit preview if set
-        if person.preview_photo_id:
-            return f"/api/people/{person_name}/photos/{person.preview_photo_id}/file"
-        
-        # Fall back to first photo
-        if person.photo_paths:
-            return f"/api/people/{person_name}/photos/{person.photo_paths[0].name}/file"
-        
-        return None
+        return self._people[person_name].preview_url()
 
-    def detect_faces(self, image_bgr: np.ndarray) -> list[FaceDetection]:
-        """Detect faces in an image and extract embeddings."""
+    def detect_faces(self, image_bgr: np.ndarray, detect_scale: float = 1.0) -> list[FaceDetection]:
+        """Detect faces in an image and extract embeddings.
+        
+        detect_scale below 1.0 runs the detector network at a smaller input
+        size, trading small-face recall for speed.
+        """
         if not self._initialized or self._detector is None:
             raise RuntimeError("Face recognition engine not initialized")
         
-        return self._detect_with_retry(image_bgr)
+        rs = get_runtime_settings()
+        return self._detect_with_retry(image_bgr, max_side=rs.detection_max_side, detect_scale=detect_scale)
 
     def match_face(self, embedding: np.ndarray) -> tuple[str, float]:
         """Find the best matching person for an embedding."""
-        best_name = "(unknown)"
-        best_dist = float("inf")
-
-        for person in self._people.values():
-            for emb in person.embeddings:
-                dist = self._cosine_distance(embedding, emb)
-                if dist < best_dist:
-                    best_dist = dist
-                    best_name = person.name
+        names, distances = self.match_faces(np.asarray(embedding, dtype=np.float32)[None, :])
+        return names[0], float(distances[0])
 
-        return best_name, best_dist
+    def match_faces(self, embeddings: np.ndarray) -> tuple[list[str], np.ndarray]:
+        """Find the best matching person for each row of an (M, D) embedding array.
+        
+        InsightFace embeddings are unit-normalized, so cosine similarity
+        against the whole gallery is a single batched inner-product search
+        (FAISS), one SIMD distance matrix (simsimd), a parallel JIT kernel
+        (numba) or one matrix product (numpy), in order of preference.
+        
+        Returns the matched names and their cosine distances; with an empty
+        gallery every face is "(unknown)" at infinite distance.
+        """
+        count = len(embeddings)
+        matrix, names, index = self._gallery
+        if not names:
+            return ["(unknown)"] * count, np.full(count, np.inf, dtype=np.float32)
+
+        queries = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if index is not None:
+            sims, ids = index.search(queries, 1)
+            return [names[i] for i in ids[:, 0].tolist()], 1.0 - sims[:, 0]
+
+        if simsimd is not None:
+            distances = np.asarray(simsimd.cdist(queries, matrix, "cosine"))
+            best = distances.argmin(axis=1)
+            return (
+                [names[i] for i in best.tolist()],
+                distances[np.arange(count), best].astype(np.float32),
+            )
 
-    def recognize_frame(self, image_bgr: np.ndarray, masks: list[dict] | None = None) -> tuple[list[dict], list[dict]]:
+        if _batch_cosine_distance is not None:
+            distances = self._context().rows("distances", count, len(names))
+            _batch_cosine_distance(matrix, queries, distances)
+            best = distances.argmin(axis=1)
+            return [names[i] for i in best.tolist()], distances[np.arange(count), best]
+
+        sims = queries @ matrix.T
+        best = sims.argmax(axis=1)
+        return [names[i] for i in best.tolist()], 1.0 - sims[np.arange(count), best]
+
+    def recognize_frame(
+        self,
+        image_bgr: np.ndarray,
+        masks: list[dict] | None = None,
+        inplace: bool = False,
+        skip_static: bool = False,
+        detect_scale: float = 1.0,
+    ) -> tuple[list[dict], list[dict]]:
         """Recognize faces in a frame and return matches and themes to play.
         
         Args:
             image_bgr: BGR image as numpy array
             masks: Optional list of mask dicts with normalized coordinates.
                    If None, masks are loaded from runtime settings.
+                   Faces centred inside a mask are dropped, or with
+                   blank_masked_regions the regions are blacked out
+                   before detection.
+            inplace: The caller owns image_bgr and does not need it
+                     afterwards, so masks may be blanked in it directly.
+            skip_static: image_bgr is the next frame of a single video
+                         stream; when it barely differs from the last
+                         analyzed frame, that frame's detections are
+                         reused instead of running the detector again.
+                         Matching and theme cooldowns still run.
+            detect_scale: Fraction of the detector's input size to run it
+                          at (see detect_faces).
         """
         rs = get_runtime_settings()
         
-        # Apply masks to exclude regions from face detection
         if masks is None:
             masks = parse_camera_masks(rs.camera_masks)
         
-        masked_image = apply_masks_to_image(image_bgr, masks)
-        detections = self.detect_faces(masked_image)
+        thumb = None
+        detections = None
+        if skip_static:
+            thumb = self._frame_thumbnail(image_bgr)
+            detections = self._reuse_static_detections(thumb, image_bgr.shape, masks)
+
+        if detections is None:
+            detections = self._detect_outside_masks(image_bgr, masks, inplace, detect_scale)
+            if thumb is not None:
+                self._static_frame = (thumb, time.monotonic(), image_bgr.shape, masks, detections)
+
         faces = []
         themes_to_play = []
         now = time.time()
 
-        for det in detections:
-            name, distance = self.match_face(det.embedding)
-            is_match = distance < rs.embedding_distance_threshold
+        if not detections:
+            return faces, themes_to_play
 
+        # Gather embeddings into the reused query block and match every
+        # face against the gallery in one batched search
+        queries = self._context().rows("queries", len(detections), EMBEDDING_DIM)
+        for row, det in zip(queries, detections):
+            row[:] = det.embedding
+        names, distances = self.match_faces(queries)
+        is_match = (distances < rs.embedding_distance_threshold).tolist()
+        # Clip the tiny negative distances float16 search can give for exact matches
+        rounded = np.round(np.maximum(distances.astype(np.float64), 0.0), 4).tolist()
+
+        for det, name, distance, matched in zip(detections, names, rounded, is_match):
             faces.append({
                 "box": {
                     "x": det.x,
@@ -470,12 +1238,12 @@ class FaceRecognitionEngine:
                     "height": det.height,
                 },
                 "name": name,
-                "distance": round(distance, 4),
-                "is_match": is_match,
+                "distance": distance,
+                "is_match": matched,
             })
 
             # Handle audio cooldown
-            if is_match and name in self._people:
+            if matched and name in self._people:
                 person = self._people[name]
                 should_play = person.should_play_theme(now)
                 person.mark_seen(now)
@@ -489,11 +1257,77 @@ class FaceRecognitionEngine:
 
         return faces, themes_to_play
 
-    def _detect_with_retry(self, image_bgr: np.ndarray) -> list[FaceDetection]:
-        """Detect faces with optional upscaling retry."""
+    def _detect_outside_masks(
+        self, image_bgr: np.ndarray, masks: list[dict], inplace: bool, detect_scale: float = 1.0
+    ) -> list[FaceDetection]:
+        """Detect faces, ignoring those in masked regions (see recognize_frame)."""
+        if not masks:
+            return self.detect_faces(image_bgr, detect_scale)
+        elif get_runtime_settings().blank_masked_regions:
+            # Black out masked regions so the detector never sees them
+            if inplace:
+                masked_image = apply_masks_to_image(image_bgr, masks, inplace=True)
+            elif image_bgr.dtype == np.uint8:
+                masked_image = apply_masks_to_image(
+                    image_bgr, masks, out=self._context().image("masked", image_bgr.shape)
+                )
+            else:
+                masked_image = apply_masks_to_image(image_bgr, masks)
+            return self.detect_faces(masked_image, detect_scale)
+        else:
+            # Detect on the full frame and drop faces centred in a mask
+            h, w = image_bgr.shape[:2]
+            rects = _mask_pixel_rects(masks, h, w)
+            return [
+                det for det in self.detect_faces(image_bgr, detect_scale)
+                if not _center_in_rects(det.x, det.y, det.width, det.height, rects)
+            ]
+
+    @staticmethod
+    def _frame_thumbnail(image_bgr: np.ndarray) -> np.ndarray:
+        """Tiny grey thumbnail used to tell whether the scene has changed."""
+        small = cv2.resize(image_bgr, STATIC_FRAME_SIZE, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.int16)
+
+    def _reuse_static_detections(
+        self, thumb: np.ndarray, shape: tuple[int, ...], masks: list[dict]
+    ) -> Optional[list[FaceDetection]]:
+        """Detections of the last analyzed frame if this one is effectively the same."""
+        last = self._static_frame
+        if last is None:
+            return None
+        last_thumb, analyzed_at, last_shape, last_masks, detections = last
+        if last_shape != shape or last_masks is not masks:
+            return None
+        if time.monotonic() - analyzed_at >= STATIC_FRAME_MAX_AGE:
+            return None
+        if np.abs(thumb - last_thumb).mean() >= STATIC_FRAME_DIFF:
+            return None
+        return detections
+
+    def _detect_with_retry(
+        self, image_bgr: np.ndarray, max_side: int = 0, detect_scale: float = 1.0
+    ) -> list[FaceDetection]:
+        """Detect faces with optional upscaling retry.
+        
+        If max_side is set and the image is larger, the first pass runs on
+        a copy downscaled to that longest side (the detector's input size),
+        with boxes mapped back to the original image.
+        """
         rs = get_runtime_settings()
         
-        detections = self._detect_faces_raw(image_bgr)
+        h, w = image_bgr.shape[:2]
+        if max_side and max(h, w) > max_side:
+            scale = max_side / max(h, w)
+            small_w, small_h = round(w * scale), round(h * scale)
+            small = self._resize(
+                image_bgr, (small_w, small_h), "downscaled", interpolation=cv2.INTER_AREA
+            )
+            detections = self._scale_boxes(self._detect_faces_raw(small, detect_scale), scale)
+        else:
+            detections = self._detect_faces_raw(image_bgr, detect_scale)
         if detections:
             return detections
 
@@ -502,83 +1336,155 @@ class FaceRecognitionEngine:
             return detections
 
         # Retry with upscaling
-        h, w = image_bgr.shape[:2]
         if max(h, w) >= 1600:
             return detections
 
+        # On full-size frames, skip the retry when a quick cascade scan
+        # finds nothing face-like either (e.g. an empty scene)
+        if min(h, w) >= 640 and not self._cascade_finds_face(image_bgr):
+            return detections
+
         factor = rs.upscale_factor
-        scaled = cv2.resize(
-            image_bgr,
-            (int(w * factor), int(h * factor)),
-            interpolation=cv2.INTER_CUBIC,
+        scaled_w, scaled_h = int(w * factor), int(h * factor)
+        scaled = self._resize(
+            image_bgr, (scaled_w, scaled_h), "scaled", interpolation=cv2.INTER_LINEAR
         )
-        scaled_detections = self._detect_faces_raw(scaled)
+        return self._scale_boxes(self._detect_faces_raw(scaled, detect_scale), factor)
+
+    def _cascade_finds_face(self, image_bgr: np.ndarray) -> bool:
+        """Whether the Haar cascade sees a face; True when it can't tell."""
+        ctx = self._context()
+        cascade = ctx.face_cascade()
+        if cascade is None:
+            return True
+        h, w = image_bgr.shape[:2]
+        scale = min(1.0, HAAR_MAX_SIDE / max(h, w))
+        small_w, small_h = round(w * scale), round(h * scale)
+        if self._use_opencl:
+            # Resize, convert and scan on the device; only the hits come back
+            small = cv2.resize(cv2.UMat(image_bgr), (small_w, small_h), interpolation=cv2.INTER_AREA)
+            if image_bgr.ndim == 3:
+                small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        else:
+            small = cv2.resize(
+                image_bgr,
+                (small_w, small_h),
+                dst=ctx.image("cascade", (small_h, small_w) + image_bgr.shape[2:]),
+                interpolation=cv2.INTER_AREA,
+            )
+            if small.ndim == 3:
+                small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=ctx.image("cascade_grey", (small_h, small_w)))
+        # Loose parameters: this only rejects frames, so false positives are cheap
+        faces = cascade.detectMultiScale(small, scaleFactor=1.2, minNeighbors=2, minSize=(20, 20))
+        return len(faces) > 0
+
+    def _resize(
+        self, image_bgr: np.ndarray, size: tuple[int, int], buffer: str, interpolation: int
+    ) -> np.ndarray:
+        """Resize an image for detection into this thread's named buffer.
         
-        # Scale boxes back to original size
-        for det in scaled_detections:
+        With OpenCL the resize runs on the device and the result is
+        downloaded into a new array instead.
+        """
+        if self._use_opencl:
+            return cv2.resize(cv2.UMat(image_bgr), size, interpolation=interpolation).get()
+        width, height = size
+        return cv2.resize(
+            image_bgr,
+            size,
+            dst=self._context().image(buffer, (height, width) + image_bgr.shape[2:]),
+            interpolation=interpolation,
+        )
+
+    @staticmethod
+    def _scale_boxes(detections: list[FaceDetection], factor: float) -> list[FaceDetection]:
+        """Map boxes detected on an image resized by factor back to the original size."""
+        for det in detections:
             det.x = int(det.x / factor)
             det.y = int(det.y / factor)
             det.width = int(det.width / factor)
             det.height = int(det.height / factor)
-        
-        return scaled_detections
+        return detections
 
-    def _detect_faces_raw(self, image_bgr: np.ndarray) -> list[FaceDetection]:
-        """Raw face detection without retry."""
+    def _detect_faces_raw(self, image_bgr: np.ndarray, detect_scale: float = 1.0) -> list[FaceDetection]:
+        """Raw face detection without retry.
+        
+        Bypasses FaceAnalysis.get(), which runs the recognizer once per face:
+        all aligned crops are embedded in a single batched inference call.
+        """
         if self._detector is None:
             return []
 
         rs = get_runtime_settings()
-        faces = self._detector.get(image_bgr)
-        results = []
+        kwargs = {}
+        if detect_scale < 1.0:
+            # The detector letterboxes into its input and maps boxes back,
+            # so only the network size changes
+            side = max(
+                DETECTOR_STRIDE,
+                round(DETECTOR_INPUT_SIZE * detect_scale / DETECTOR_STRIDE) * DETECTOR_STRIDE,
+            )
+            kwargs["input_size"] = (side, side)
+        bboxes, kpss = self._detector.det_model.detect(image_bgr, max_num=0, metric="default", **kwargs)
+        if bboxes.shape[0] == 0 or kpss is None:
+            return []
 
-        for face in faces:
-            x1, y1, x2, y2 = face.bbox.astype(int)
-            score = float(face.det_score)
+        keep = bboxes[:, 4] >= rs.detection_score_threshold
+        bboxes = bboxes[keep]
+        kpss = kpss[keep]
+        if bboxes.shape[0] == 0:
+            return []
 
-            if score < rs.detection_score_threshold or face.normed_embedding is None:
-                continue
+        recognizer = self._detector.models["recognition"]
+        size = recognizer.input_size[0]
+        crops = [self._norm_crop(image_bgr, landmark=kps, image_size=size) for kps in kpss]
+        feats = np.asarray(recognizer.get_feat(crops), dtype=np.float32).reshape(len(crops), -1)
+        feats /= np.maximum(np.linalg.norm(feats, axis=1, keepdims=True), 1e-12)
 
-            results.append(FaceDetection(
+        boxes = bboxes[:, :4].astype(int)
+        return [
+            FaceDetection(
                 x=int(x1),
                 y=int(y1),
                 width=int(x2 - x1),
                 height=int(y2 - y1),
-                score=score,
-                embedding=np.array(face.normed_embedding, dtype=np.float32),
-            ))
-
-        return results
-
-    @staticmethod
-    def _cosine_distance(a: np.ndarray, b: np.ndarray) -> float:
-        """Compute cosine distance between two embeddings."""
-        denom = (np.linalg.norm(a) * np.linalg.norm(b)) + 1e-8
-        return 1.0 - float(np.dot(a, b) / denom)
+                score=float(score),
+                embedding=feat,
+            )
+            for (x1, y1, x2, y2), score, feat in zip(boxes, bboxes[:, 4], feats)
+        ]
 
     @staticmethod
     def _load_image_with_exif(path: Path) -> np.ndarray:
-        """Load image with EXIF rotation applied."""
-        img = Image.open(path)
-        img = ImageOps.exif_transpose(img)
-        return cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-
-    @staticmethod
-    def _find_theme_file(person_dir: Path) -> Optional[Path]:
-        """Find the first audio file in a person's directory."""
-        for ext in ["*.mp3", "*.MP3", "*.wav", "*.WAV", "*.m4a", "*.M4A"]:
-            files = list(person_dir.glob(ext))
-            if files:
-                return files[0]
-        return None
+        """Load image as BGR with EXIF rotation applied.
+        
+        OpenCV decodes straight to BGR and applies the EXIF orientation
+        itself; PIL is only used for formats OpenCV cannot read.
+        """
+        img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if img is not None:
+            return img
+        pil_img = ImageOps.exif_transpose(Image.open(path)).convert("RGB")
+        return cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
 
     @staticmethod
-    def _get_image_paths(person_dir: Path) -> list[Path]:
-        """Get all image paths in a person's directory."""
-        paths = []
-        for ext in ["*.jpeg", "*.JPEG", "*.jpg", "*.JPG", "*.png", "*.PNG"]:
-            paths.extend(person_dir.glob(ext))
-        return sorted(paths)
+    def _scan_person_dir(person_dir: Path) -> tuple[list[Path], Optional[Path]]:
+        """Find a person's images (sorted) and theme file in one directory read.
+        
+        The theme is the first audio file found, preferring MP3 over WAV
+        over M4A.
+        """
+        images = []
+        themes = []
+        with os.scandir(person_dir) as entries:
+            for entry in entries:
+                suffix = os.path.splitext(entry.name)[1].lower()
+                if suffix in IMAGE_EXTENSIONS and entry.is_file():
+                    images.append(Path(entry.path))
+                elif suffix in AUDIO_EXTENSIONS and entry.is_file():
+                    themes.append((AUDIO_EXTENSIONS.index(suffix), Path(entry.path)))
+        theme_path = min(themes, key=lambda item: item[0])[1] if themes else None
+        return sorted(images), theme_path
 
     @staticmethod
     def _load_preview_id(person_dir: Path) -> Optional[str]:
@@ -78,6 +78,31 @@ class AudioPlayer:
                 logger.error("Failed to play audio %s: %s", path, exc)
                 return False
     
+    def prefetch(self, paths: list[Path]) -> None:
+        """
+        Decode audio files into the sound cache ahead of their first play.
+        Blocking; run it off the event loop.
+        """
+        if not _ensure_pygame():
+            return
+        
+        import pygame
+        
+        for path in paths:
+            path_str = str(path)
+            with self._lock:
+                if path_str in self._sound_cache:
+                    continue
+            try:
+                # Decode outside the lock so play() is never held up
+                sound = pygame.mixer.Sound(path_str)
+            except Exception as exc:
+                logger.warning("Failed to prefetch audio %s: %s", path, exc)
+                continue
+            with self._lock:
+                self._sound_cache.setdefault(path_str, sound)
+        logger.info("Prefetched %d audio files", len(paths))
+    
     def stop(self) -> None:
         """Stop the currently playing audio."""
         if not _pygame_initialized:
@@ -122,6 +147,11 @@ def play_theme(path: Path) -> bool:
     return audio_player.play(path)
 
 
+def prefetch_themes(paths: list[Path]) -> None:
+    """Convenience function to decode theme songs before they are needed."""
+    audio_player.prefetch(paths)
+
+
 def stop_audio() -> None:
     """Convenience function to stop audio playback."""
     audio_player.stop()
@@ -1,5 +1,6 @@
 """USB webcam capture using OpenCV."""
 import logging
+import sys
 import threading
 import time
 from typing import Optional
@@ -11,6 +12,9 @@ from ..core.config import settings, get_runtime_settings
 
 logger = logging.getLogger(__name__)
 
+# A frame older than this is treated as missing (grabber stalled or camera gone)
+STALE_FRAME_SECONDS = 2.0
+
 
 class Camera:
     """USB webcam capture wrapper using OpenCV."""
@@ -21,15 +25,31 @@ class Camera:
         width: int = 1280,
         height: int = 720,
         fps: int = 15,
+        fourcc: str = "MJPG",
+        gstreamer: bool = False,
     ):
         self.device = device
         self.width = width
         self.height = height
         self.fps = fps
+        self.fourcc = fourcc
+        self.gstreamer = gstreamer
         
         self._capture: Optional[cv2.VideoCapture] = None
         self._lock = threading.Lock()
         self._connected = False
+        
+        # Latest frame from the grabber thread, guarded by a lock that is
+        # only held to swap the reference (never across a blocking read).
+        # The sequence number increases with every frame; waiters on the
+        # condition are woken when it does.
+        self._grabber: Optional[threading.Thread] = None
+        self._stop_grabbing: Optional[threading.Event] = None
+        self._frame_lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._frame_lock)
+        self._latest: Optional[np.ndarray] = None
+        self._latest_time = 0.0
+        self._latest_seq = 0
     
     def open(self) -> bool:
         """Open the camera device."""
@@ -40,7 +60,7 @@ class Camera:
             logger.info("Opening camera device %d at %dx%d @ %d FPS", 
                        self.device, self.width, self.height, self.fps)
             
-            self._capture = cv2.VideoCapture(self.device)
+            self._capture = self._open_capture()
             
             if not self._capture.isOpened():
                 logger.error("Failed to open camera device %d", self.device)
@@ -48,7 +68,10 @@ class Camera:
                 self._connected = False
                 return False
             
-            # Configure camera
+            # Configure camera. The pixel format must be requested before
+            # the resolution, which is validated against it.
+            if self.fourcc and not self.gstreamer:
+                self._capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
             self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
             self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
             self._capture.set(cv2.CAP_PROP_FPS, self.fps)
@@ -60,35 +83,123 @@ class Camera:
             actual_w = int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH))
             actual_h = int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
             actual_fps = self._capture.get(cv2.CAP_PROP_FPS)
+            fourcc_code = int(self._capture.get(cv2.CAP_PROP_FOURCC))
+            actual_fourcc = "".join(chr((fourcc_code >> (8 * i)) & 0xFF) for i in range(4))
             
-            logger.info("Camera opened: actual resolution %dx%d @ %.1f FPS", 
-                       actual_w, actual_h, actual_fps)
+            logger.info("Camera opened: actual resolution %dx%d @ %.1f FPS (%s)", 
+                       actual_w, actual_h, actual_fps, actual_fourcc.strip("\x00") or "default")
             
             self._connected = True
+            
+            # Blocking reads happen on a dedicated thread; read() only
+            # picks up the newest frame
+            self._stop_grabbing = threading.Event()
+            self._grabber = threading.Thread(
+                target=self._grab_loop,
+                args=(self._capture, self._stop_grabbing),
+                name=f"camera-{self.device}",
+                daemon=True,
+            )
+            self._grabber.start()
             return True
     
+    def _open_capture(self) -> cv2.VideoCapture:
+        """Create the VideoCapture for this device.
+        
+        Uses a GStreamer pipeline that decodes MJPEG with jpegdec when
+        enabled, the V4L2 backend directly on Linux, and OpenCV's default
+        backend elsewhere.
+        """
+        if self.gstreamer:
+            pipeline = (
+                f"v4l2src device=/dev/video{self.device} ! "
+                f"image/jpeg,width={self.width},height={self.height},framerate={self.fps}/1 ! "
+                "jpegdec ! videoconvert ! video/x-raw,format=BGR ! "
+                "appsink drop=true max-buffers=1"
+            )
+            return cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if sys.platform.startswith("linux"):
+            return cv2.VideoCapture(self.device, cv2.CAP_V4L2)
+        return cv2.VideoCapture(self.device)
+    
+    def _grab_loop(self, capture: cv2.VideoCapture, stop: threading.Event) -> None:
+        """Continuously read frames into the latest-frame slot until stopped.
+        
+        The capture is released here, once no read can be in progress on it.
+        """
+        try:
+            while not stop.is_set():
+                ret, frame = capture.read()
+                if stop.is_set():
+                    break
+                
+                if not ret or frame is None:
+                    logger.warning("Failed to read frame from camera")
+                    with self._frame_lock:
+                        self._latest = None
+                    stop.wait(0.1)
+                    continue
+                
+                with self._frame_ready:
+                    self._latest = frame
+                    self._latest_time = time.monotonic()
+                    self._latest_seq += 1
+                    self._frame_ready.notify_all()
+        finally:
+            capture.release()
+    
     def close(self) -> None:
-        """Close the camera device."""
+        """Close the camera device.
+        
+        Blocks until the grabber thread has released the device (up to a
+        couple of seconds); run it off the event loop.
+        """
         with self._lock:
-            if self._capture is not None:
-                logger.info("Closing camera device %d", self.device)
-                self._capture.release()
-                self._capture = None
-                self._connected = False
+            if self._capture is None:
+                return
+            logger.info("Closing camera device %d", self.device)
+            grabber = self._grabber
+            self._stop_grabbing.set()
+            self._grabber = None
+            self._stop_grabbing = None
+            self._capture = None
+            self._connected = False
+            with self._frame_lock:
+                self._latest = None
+        
+        # The grabber releases the capture once its current read returns
+        grabber.join(timeout=2.0)
+        if grabber.is_alive():
+            logger.warning("Camera read still blocked; the device is released when it returns")
     
     def read(self) -> Optional[np.ndarray]:
-        """Read a frame from the camera. Returns None if not available."""
-        with self._lock:
-            if self._capture is None or not self._connected:
-                return None
-            
-            ret, frame = self._capture.read()
-            
-            if not ret or frame is None:
-                logger.warning("Failed to read frame from camera")
-                return None
-            
-            return frame
+        """Return the newest frame from the camera. Returns None if not available.
+        
+        Does not block: the frame comes from the grabber thread, so the same
+        frame may be returned again until a new one arrives. Callers must not
+        modify it in place.
+        """
+        with self._frame_lock:
+            return self._fresh_frame()
+    
+    def read_next(self, seq: int, timeout: float) -> tuple[Optional[np.ndarray], int]:
+        """Wait for a frame newer than sequence number seq, then return it
+        with its sequence number. Blocking; run it off the event loop.
+        
+        After timeout the current frame is returned even if it is not newer.
+        As with read(), the frame is None if not available and must not be
+        modified in place.
+        """
+        with self._frame_ready:
+            self._frame_ready.wait_for(lambda: self._latest_seq != seq, timeout)
+            return self._fresh_frame(), self._latest_seq
+    
+    def _fresh_frame(self) -> Optional[np.ndarray]:
+        """The latest frame unless it is stale (call with the frame lock held)."""
+        frame = self._latest
+        if frame is None or time.monotonic() - self._latest_time > STALE_FRAME_SECONDS:
+            return None
+        return frame
     
     def is_connected(self) -> bool:
         """Check if the camera is connected and working."""
@@ -117,5 +228,7 @@ def create_camera() -> Camera:
         width=settings.camera_width,
         height=settings.camera_height,
         fps=rs.camera_fps,
+        fourcc=settings.camera_fourcc,
+        gstreamer=settings.camera_gstreamer,
     )
 
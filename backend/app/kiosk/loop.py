@@ -2,143 +2,251 @@
 import asyncio
 import logging
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import anyio
 import cv2
+from anyio.abc import TaskGroup
 import numpy as np
 
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+except ImportError:
+    # Optional: libjpeg-turbo encoder for the kiosk stream, falls back to cv2.imencode
+    TurboJPEG = None
+
 from ..core.config import settings, get_runtime_settings
-from ..core.face import engine, parse_camera_masks
+from ..core.face import engine, parse_camera_masks, _mask_pixel_rects
 from .camera import Camera, create_camera
-from .audio import play_theme
+from .audio import play_theme, prefetch_themes
 from .state import kiosk_state, RecognitionEvent
 
 logger = logging.getLogger(__name__)
 
+_turbojpeg = None
+if TurboJPEG is not None:
+    try:
+        _turbojpeg = TurboJPEG()
+    except (OSError, RuntimeError) as exc:
+        # The Python package is installed but the libturbojpeg library is not
+        logger.warning("TurboJPEG unavailable, using OpenCV for JPEG encoding: %s", exc)
+
+
+# Longest the loop waits for a new camera frame before reusing the last one
+FRAME_WAIT_SECONDS = 0.5
+
+# While frames keep arriving, the camera connection is only checked this often
+CONNECTION_CHECK_SECONDS = 1.0
+
+# Low power mode shrinks the detector input in these steps when
+# recognition is slow, down to MIN_DETECT_SCALE
+DETECT_SCALE_STEP = 0.25
+MIN_DETECT_SCALE = 0.5
+
+# Face label text style
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_FONT_SCALE = 0.6
+LABEL_FONT_THICKNESS = 2
+
 
-def draw_face_overlays(frame: np.ndarray, faces: list[dict]) -> np.ndarray:
-    """Draw face bounding boxes and labels on the frame."""
-    result = frame.copy()
+@lru_cache(maxsize=256)
+def _text_size(label: str) -> tuple[int, int, int]:
+    """Width, height and baseline of a face label."""
+    (text_w, text_h), baseline = cv2.getTextSize(label, LABEL_FONT, LABEL_FONT_SCALE, LABEL_FONT_THICKNESS)
+    return text_w, text_h, baseline
+
+
+@lru_cache(maxsize=256)
+def _label_bitmap(label: str, color: tuple[int, int, int]) -> tuple[np.ndarray, np.ndarray, int, int]:
+    """Pre-rendered face label: its black background box and text.
     
-    for face in faces:
-        box = face["box"]
-        x, y, w, h = box["x"], box["y"], box["width"], box["height"]
-        is_match = face["is_match"]
-        name = face["name"]
-        
+    Returns the BGR pixels, a mask of the pixels drawn and the offset of
+    the bitmap from the label's top-left corner (the text's descenders
+    can reach past the box).
+    """
+    text_w, text_h, baseline = _text_size(label)
+    margin = baseline + LABEL_FONT_THICKNESS
+    canvas_h, canvas_w = text_h + 11 + 2 * margin, text_w + 11 + 2 * margin
+    pixels = np.zeros((canvas_h, canvas_w, 3), dtype=np.uint8)
+    drawn = np.zeros((canvas_h, canvas_w), dtype=np.uint8)
+    
+    # Background box, then the text over it
+    drawn[margin:margin + text_h + 11, margin:margin + text_w + 11] = 255
+    origin = (margin + 5, margin + text_h + 3)
+    cv2.putText(pixels, label, origin, LABEL_FONT, LABEL_FONT_SCALE, color, LABEL_FONT_THICKNESS)
+    cv2.putText(drawn, label, origin, LABEL_FONT, LABEL_FONT_SCALE, 255, LABEL_FONT_THICKNESS)
+    
+    # Crop to the drawn pixels
+    ys, xs = np.nonzero(drawn)
+    top, bottom, left, right = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+    return (
+        pixels[top:bottom, left:right].copy(),
+        drawn[top:bottom, left:right, None] > 0,
+        int(left) - margin,
+        int(top) - margin,
+    )
+
+
+def _paste_bitmap(
+    frame: np.ndarray, pixels: np.ndarray, mask: np.ndarray, x: int, y: int
+) -> None:
+    """Copy the masked pixels of a bitmap into the frame at (x, y), clipped to the frame."""
+    frame_h, frame_w = frame.shape[:2]
+    bitmap_h, bitmap_w = pixels.shape[:2]
+    x1, y1 = max(x, 0), max(y, 0)
+    x2, y2 = min(x + bitmap_w, frame_w), min(y + bitmap_h, frame_h)
+    if x1 >= x2 or y1 >= y2:
+        return
+    src = np.s_[y1 - y:y2 - y, x1 - x:x2 - x]
+    np.copyto(frame[y1:y2, x1:x2], pixels[src], where=mask[src])
+
+
+def draw_face_overlays(
+    frame: np.ndarray, boxes: np.ndarray, names: list[str], matches: np.ndarray
+) -> np.ndarray:
+    """Draw face bounding boxes and labels on the frame (in place).
+    
+    Args:
+        frame: BGR image as numpy array
+        boxes: (N, 4) int32 array of x, y, width, height per face
+        names: Matched name per face
+        matches: (N,) bool array, whether each face matched
+    """
+    for (x, y, w, h), name, is_match in zip(boxes.tolist(), names, matches.tolist()):
         # Color based on match status
         color = (136, 255, 0) if is_match else (68, 68, 255)  # BGR: green or red
         
         # Draw bounding box
-        cv2.rectangle(result, (x, y), (x + w, y + h), color, 2)
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
         
-        # Draw corner brackets for style
+        # Draw corner brackets for style, all eight segments in one call
         bracket_len = min(w, h) // 6
         thickness = 3
+        brackets = np.array([
+            # Top-left
+            [(x, y), (x + bracket_len, y)],
+            [(x, y), (x, y + bracket_len)],
+            # Top-right
+            [(x + w, y), (x + w - bracket_len, y)],
+            [(x + w, y), (x + w, y + bracket_len)],
+            # Bottom-left
+            [(x, y + h), (x + bracket_len, y + h)],
+            [(x, y + h), (x, y + h - bracket_len)],
+            # Bottom-right
+            [(x + w, y + h), (x + w - bracket_len, y + h)],
+            [(x + w, y + h), (x + w, y + h - bracket_len)],
+        ], dtype=np.int32)
+        cv2.polylines(frame, brackets, False, color, thickness)
         
-        # Top-left
-        cv2.line(result, (x, y), (x + bracket_len, y), color, thickness)
-        cv2.line(result, (x, y), (x, y + bracket_len), color, thickness)
-        
-        # Top-right
-        cv2.line(result, (x + w, y), (x + w - bracket_len, y), color, thickness)
-        cv2.line(result, (x + w, y), (x + w, y + bracket_len), color, thickness)
-        
-        # Bottom-left
-        cv2.line(result, (x, y + h), (x + bracket_len, y + h), color, thickness)
-        cv2.line(result, (x, y + h), (x, y + h - bracket_len), color, thickness)
-        
-        # Bottom-right
-        cv2.line(result, (x + w, y + h), (x + w - bracket_len, y + h), color, thickness)
-        cv2.line(result, (x + w, y + h), (x + w, y + h - bracket_len), color, thickness)
-        
-        # Draw name label
+        # Draw name label, pre-rendered once per name and color
         label = name if is_match else "Unknown"
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.6
-        font_thickness = 2
-        
-        (text_w, text_h), baseline = cv2.getTextSize(label, font, font_scale, font_thickness)
-        
-        # Label background
-        label_y = y + h + 5
-        cv2.rectangle(
-            result,
-            (x, label_y),
-            (x + text_w + 10, label_y + text_h + 10),
-            (0, 0, 0),
-            -1
-        )
-        
-        # Label text
-        cv2.putText(
-            result,
-            label,
-            (x + 5, label_y + text_h + 3),
-            font,
-            font_scale,
-            color,
-            font_thickness
-        )
+        pixels, mask, dx, dy = _label_bitmap(label, color)
+        _paste_bitmap(frame, pixels, mask, x + dx, y + h + 5 + dy)
     
-    return result
+    return frame
 
 
-def draw_mask_overlay(frame: np.ndarray, masks: list[dict]) -> np.ndarray:
-    """Draw white semi-transparent overlays on masked regions.
+def draw_mask_overlay(frame: np.ndarray, rects: list[tuple[int, int, int, int]]) -> np.ndarray:
+    """Draw white semi-transparent overlays on masked regions (in place).
     
     Args:
         frame: BGR image as numpy array
-        masks: List of mask dicts with normalized coordinates (0-1)
+        rects: Pixel rects of the masked regions, from mask_overlay_rects()
         
     Returns:
         Frame with white 50% opacity overlay on masked regions
     """
-    if not masks:
+    if not rects:
         return frame
     
-    result = frame.copy()
-    h, w = result.shape[:2]
-    
-    # Create overlay layer
-    overlay = result.copy()
+    # Blend white into each region (50% opacity): 0.5 * pixel + 0.5 * 255,
+    # with the white folded into the constant term
+    for x1, y1, x2, y2 in rects:
+        region = frame[y1:y2, x1:x2]
+        cv2.addWeighted(region, 0.5, region, 0.0, 127.5, region)
     
-    for mask in masks:
-        # Convert normalized coordinates to pixel coordinates
-        x = int(mask['x'] * w)
-        y = int(mask['y'] * h)
-        mask_w = int(mask['width'] * w)
-        mask_h = int(mask['height'] * h)
-        
-        # Clamp to image bounds
-        x1 = max(0, x)
-        y1 = max(0, y)
-        x2 = min(w, x + mask_w)
-        y2 = min(h, y + mask_h)
-        
-        # Draw filled white rectangle on overlay
-        if x2 > x1 and y2 > y1:
-            cv2.rectangle(overlay, (x1, y1), (x2, y2), (255, 255, 255), -1)
+    return frame
+
+
+def mask_overlay_rects(masks: list[dict], h: int, w: int) -> list[tuple[int, int, int, int]]:
+    """Disjoint (x1, y1, x2, y2) pixel rects covering the mask overlay of a frame.
     
-    # Blend overlay with original frame (50% opacity)
-    cv2.addWeighted(overlay, 0.5, result, 0.5, 0, result)
+    The overlay also covers the right and bottom edge of each mask rect.
+    Overlapping masks are split so that no pixel is blended twice.
+    """
+    rects = [
+        (x1, y1, min(w, x2 + 1), min(h, y2 + 1))
+        for x1, y1, x2, y2 in _mask_pixel_rects(masks, h, w)
+    ]
+    if len(rects) < 2:
+        result = list(rects)
+    else:
+        # Cut the plane along every rect edge, then merge covered cells
+        # into horizontal runs, one band at a time
+        xs = sorted({x for x1, _, x2, _ in rects for x in (x1, x2)})
+        ys = sorted({y for _, y1, _, y2 in rects for y in (y1, y2)})
+        result = []
+        for top, bottom in zip(ys, ys[1:]):
+            run_start = None
+            for left, right in zip(xs, xs[1:]):
+                covered = any(
+                    x1 <= left and right <= x2 and y1 <= top and bottom <= y2
+                    for x1, y1, x2, y2 in rects
+                )
+                if covered and run_start is None:
+                    run_start = left
+                elif not covered and run_start is not None:
+                    result.append((run_start, top, left, bottom))
+                    run_start = None
+            if run_start is not None:
+                result.append((run_start, top, xs[-1], bottom))
     
     return result
 
 
+@lru_cache(maxsize=4)
+def _jpeg_params(quality: int) -> tuple[int, ...]:
+    """cv2.imencode parameters for a JPEG quality."""
+    return (cv2.IMWRITE_JPEG_QUALITY, quality)
+
+
 def frame_to_jpeg(frame: np.ndarray, quality: int = 80) -> bytes:
-    """Convert a frame to JPEG bytes."""
-    encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
-    _, buffer = cv2.imencode(".jpg", frame, encode_params)
+    """Convert a frame to JPEG bytes (4:2:0 chroma subsampling)."""
+    if _turbojpeg is not None:
+        return _turbojpeg.encode(frame, quality=quality, jpeg_subsample=TJSAMP_420)
+    _, buffer = cv2.imencode(".jpg", frame, _jpeg_params(quality))
     return buffer.tobytes()
 
 
-def run_recognition_sync(frame: np.ndarray, masks: list[dict]) -> tuple[list[dict], list[dict], float]:
+def publish_frame_sync(frame: np.ndarray) -> None:
+    """Encode a frame and publish it to streaming clients (for the encoder thread)."""
+    kiosk_state.set_frame(frame_to_jpeg(frame))
+
+
+def run_recognition_sync(
+    frame: np.ndarray, masks: list[dict], detect_scale: float = 1.0
+) -> tuple[list[dict], list[dict], float]:
     """Run face recognition synchronously (for thread pool)."""
-    start = time.time()
-    faces, themes = engine.recognize_frame(frame, masks=masks)
-    process_time_ms = (time.time() - start) * 1000
+    start = time.monotonic()
+    # The frame is shared with the loop and the camera, so it is not modified
+    faces, themes = engine.recognize_frame(
+        frame, masks=masks, skip_static=True, detect_scale=detect_scale
+    )
+    # Boxes as fractions of the frame, for clients drawing their own overlay
+    h, w = frame.shape[:2]
+    for face in faces:
+        box = face["box"]
+        face["box_norm"] = {
+            "x": round(box["x"] / w, 4),
+            "y": round(box["y"] / h, 4),
+            "width": round(box["width"] / w, 4),
+            "height": round(box["height"] / h, 4),
+        }
+    process_time_ms = (time.monotonic() - start) * 1000
     return faces, themes, process_time_ms
 
 
@@ -150,14 +258,21 @@ async def kiosk_loop() -> None:
     - Plays theme audio
     - Updates shared state for streaming
     - Adapts to hardware performance (low_power_mode)
+    
+    Runs until kiosk_state.running is cleared (see start_kiosk/stop_kiosk).
     """
     logger.info("Starting kiosk loop")
-    kiosk_state.running = True
+    loop = asyncio.get_running_loop()
+    
+    # Decode theme songs in the background so the first play doesn't wait on it
+    theme_paths = [p.theme_path for p in engine.people.values() if p.theme_path]
+    if theme_paths:
+        loop.run_in_executor(None, prefetch_themes, theme_paths)
     
     camera = create_camera()
     
     # Try to open camera
-    if not camera.open():
+    if not await loop.run_in_executor(None, camera.open):
         logger.error("Failed to open camera, kiosk will retry...")
     
     kiosk_state.camera_connected = camera.is_connected()
@@ -170,43 +285,66 @@ async def kiosk_loop() -> None:
     min_interval = rs.min_recognition_interval_ms / 1000.0
     max_interval = rs.max_recognition_interval_ms / 1000.0
     target_process_time = rs.target_process_time_ms / 1000.0
+    # Adaptive detector input scale (can shrink if hardware is slow)
+    detect_scale = 1.0
     
+    frame_seq = 0
+    frame_missing = False
+    last_connection_check_time = 0.0
     last_recognition_time = 0.0
-    recognition_task: Optional[asyncio.Task] = None
-    pending_frame: Optional[np.ndarray] = None
+    # Recognition runs on one long-lived thread, one frame at a time
+    recognition_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kiosk-recognition")
+    recognition_task: Optional[asyncio.Future] = None
+    event_had_faces = False
+    
+    # JPEG encoding runs on its own thread, off the event loop
+    jpeg_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kiosk-jpeg")
+    encode_future: Optional[asyncio.Future] = None
     
     # Cache for runtime settings (re-read periodically to pick up changes)
     cached_masks: list[dict] = []
+    # Overlay rects for cached_masks at mask_rects_shape
+    mask_rects: list[tuple[int, int, int, int]] = []
+    mask_rects_shape: Optional[tuple[int, ...]] = None
     last_settings_check_time = 0.0
     settings_check_interval = 1.0  # Re-check settings every second
     
     # Performance tracking
-    recent_process_times: list[float] = []
+    recent_process_times: deque[float] = deque(maxlen=10)
+    process_time_sum = 0.0
     frame_count = 0
-    last_fps_log_time = time.time()
+    last_fps_log_time = loop.time()
+    # Monotonic deadline of the next iteration, advanced by one frame period
+    # each time so sleep overshoot does not accumulate
+    next_deadline = loop.time()
     
     if rs.low_power_mode:
         logger.info("Low power mode enabled - adaptive performance active")
     
     try:
         while kiosk_state.running:
-            loop_start = time.time()
             frame_count += 1
             
-            # Ensure camera is connected
-            if not camera.is_connected():
-                kiosk_state.camera_connected = False
-                logger.warning("Camera disconnected, attempting reconnect...")
-                if camera.reconnect():
-                    kiosk_state.camera_connected = True
-                else:
-                    await asyncio.sleep(5.0)
-                    continue
+            # Ensure camera is connected, checked every so often or right
+            # after a failed read (a fresh frame already proves it)
+            if frame_missing or loop.time() - last_connection_check_time >= CONNECTION_CHECK_SECONDS:
+                last_connection_check_time = loop.time()
+                if not camera.is_connected():
+                    kiosk_state.camera_connected = False
+                    logger.warning("Camera disconnected, attempting reconnect...")
+                    if await loop.run_in_executor(None, camera.reconnect):
+                        kiosk_state.camera_connected = True
+                    else:
+                        await asyncio.sleep(5.0)
+                        continue
             
-            # Capture frame
-            frame = camera.read()
+            # Wait for a frame newer than the last one processed
+            frame, frame_seq = await loop.run_in_executor(
+                None, camera.read_next, frame_seq, FRAME_WAIT_SECONDS
+            )
             
-            if frame is None:
+            frame_missing = frame is None
+            if frame_missing:
                 kiosk_state.camera_connected = False
                 await asyncio.sleep(0.1)
                 continue
@@ -214,23 +352,29 @@ async def kiosk_loop() -> None:
             kiosk_state.camera_connected = True
             
             # Get current time for this iteration
-            now = time.time()
+            now = loop.time()
             
             # Refresh runtime settings periodically (to pick up changes)
             if (now - last_settings_check_time) >= settings_check_interval:
                 rs = get_runtime_settings()
-                cached_masks = parse_camera_masks(rs.camera_masks)
+                masks = parse_camera_masks(rs.camera_masks)
+                if masks is not cached_masks:
+                    cached_masks = masks
+                    mask_rects_shape = None
                 # Update interval settings (but preserve adaptive adjustments)
                 base_interval = rs.recognition_interval_ms / 1000.0
                 min_interval = rs.min_recognition_interval_ms / 1000.0
                 max_interval = rs.max_recognition_interval_ms / 1000.0
                 target_process_time = rs.target_process_time_ms / 1000.0
-                # Reset recognition interval to base if it was changed
+                # Reset recognition interval and scale if they were changed
                 if not rs.low_power_mode:
                     recognition_interval = base_interval
+                    detect_scale = 1.0
                 last_settings_check_time = now
             
-            # Mirror the frame if enabled
+            # Mirror the frame if enabled. Flipping yields a new frame the
+            # loop owns; otherwise it is the camera's and must not be drawn on.
+            frame_owned = rs.mirror_feed
             if rs.mirror_feed:
                 frame = cv2.flip(frame, 1)
             
@@ -241,26 +385,32 @@ async def kiosk_loop() -> None:
                     process_time_sec = process_time_ms / 1000.0
                     
                     # Track processing times for adaptive interval
+                    # (running sum, minus the time the deque is about to drop)
+                    if len(recent_process_times) == recent_process_times.maxlen:
+                        process_time_sum -= recent_process_times[0]
                     recent_process_times.append(process_time_sec)
-                    if len(recent_process_times) > 10:
-                        recent_process_times.pop(0)
+                    process_time_sum += process_time_sec
                     
                     # Adaptive recognition interval (low power mode)
-                    if rs.low_power_mode and recent_process_times:
-                        avg_process_time = sum(recent_process_times) / len(recent_process_times)
+                    if rs.low_power_mode:
+                        avg_process_time = process_time_sum / len(recent_process_times)
                         
                         if avg_process_time > target_process_time:
-                            # Processing is slow - increase interval
+                            # Processing is slow - increase interval and
+                            # run the detector on a smaller input
                             recognition_interval = min(
                                 max_interval,
                                 recognition_interval * 1.2
                             )
+                            detect_scale = max(MIN_DETECT_SCALE, detect_scale - DETECT_SCALE_STEP)
                         elif avg_process_time < target_process_time * 0.5:
-                            # Processing is fast - decrease interval
+                            # Processing is fast - decrease interval and
+                            # grow the detector input back
                             recognition_interval = max(
                                 min_interval,
                                 recognition_interval * 0.9
                             )
+                            detect_scale = min(1.0, detect_scale + DETECT_SCALE_STEP)
                     
                     # Update faces in state
                     kiosk_state.set_faces(faces)
@@ -271,8 +421,10 @@ async def kiosk_loop() -> None:
                         if theme_path.exists():
                             play_theme(theme_path)
                     
-                    # Push event for WebSocket clients
-                    if faces:
+                    # Push event for WebSocket clients, including one empty
+                    # event when the last faces leave so overlays clear
+                    if faces or event_had_faces:
+                        event_had_faces = bool(faces)
                         event = RecognitionEvent(
                             faces=faces,
                             themes_played=themes_to_play,
@@ -290,72 +442,100 @@ async def kiosk_loop() -> None:
             
             if should_recognize and engine.is_initialized and recognition_task is None:
                 last_recognition_time = now
-                pending_frame = frame.copy()
-                recognition_task = asyncio.create_task(
-                    asyncio.to_thread(run_recognition_sync, pending_frame, cached_masks)
+                # Recognition only reads the frame; from here on it is shared
+                # with the recognition thread and must not be drawn on
+                recognition_task = loop.run_in_executor(
+                    recognition_pool, run_recognition_sync, frame, cached_masks, detect_scale
                 )
+                frame_owned = False
             
-            # Use cached faces for overlay
-            faces = kiosk_state.get_faces()
-            
-            # Draw overlays on frame
-            if faces:
-                frame = draw_face_overlays(frame, faces)
-            
-            # Draw mask overlay (white 50% opacity)
-            if cached_masks:
-                frame = draw_mask_overlay(frame, cached_masks)
-            
-            # Convert to JPEG and update state
-            jpeg_bytes = frame_to_jpeg(frame)
-            kiosk_state.set_frame(jpeg_bytes)
+            # Draw and encode only while someone is watching the stream
+            # (recognition above still runs, so themes and events fire)
+            if kiosk_state.has_subscribers:
+                if not settings.overlay_client_side:
+                    # Use cached faces for overlay
+                    boxes, names, matches = kiosk_state.get_face_overlay()
+                    
+                    # Overlays are drawn in place, on a private copy if needed
+                    if (names or cached_masks) and not frame_owned:
+                        frame = frame.copy()
+                    
+                    # Draw overlays on frame
+                    if names:
+                        frame = draw_face_overlays(frame, boxes, names, matches)
+                    
+                    # Draw mask overlay (white 50% opacity)
+                    if cached_masks:
+                        if mask_rects_shape != frame.shape:
+                            mask_rects = mask_overlay_rects(cached_masks, *frame.shape[:2])
+                            mask_rects_shape = frame.shape
+                        frame = draw_mask_overlay(frame, mask_rects)
+                
+                # Convert to JPEG and update state on the encoder thread; the
+                # frame is dropped if the previous one is still being encoded
+                if encode_future is None or encode_future.done():
+                    if encode_future is not None and encode_future.exception() is not None:
+                        logger.error("Frame encoding error: %s", encode_future.exception())
+                    encode_future = loop.run_in_executor(jpeg_pool, publish_frame_sync, frame)
+            else:
+                kiosk_state.count_frame()
             
             # Log FPS periodically (every 30 seconds)
             if rs.low_power_mode and (now - last_fps_log_time) >= 30.0:
                 elapsed_log = now - last_fps_log_time
                 fps = frame_count / elapsed_log
-                avg_proc = (sum(recent_process_times) / len(recent_process_times) * 1000) if recent_process_times else 0
+                avg_proc = (process_time_sum / len(recent_process_times) * 1000) if recent_process_times else 0
                 logger.info(
-                    "Performance: %.1f FPS, avg recognition: %.0fms, interval: %.0fms",
-                    fps, avg_proc, recognition_interval * 1000
+                    "Performance: %.1f FPS, avg recognition: %.0fms, interval: %.0fms, detect scale: %.2f",
+                    fps, avg_proc, recognition_interval * 1000, detect_scale
                 )
                 frame_count = 0
                 last_fps_log_time = now
             
-            # Calculate sleep time to maintain target FPS
-            elapsed = time.time() - loop_start
-            target_interval = 1.0 / rs.camera_fps
-            sleep_time = max(0.001, target_interval - elapsed)
-            await asyncio.sleep(sleep_time)
+            # Sleep until the next frame deadline to maintain target FPS,
+            # starting over if the loop has fallen well behind
+            next_deadline += 1.0 / rs.camera_fps
+            delay = next_deadline - loop.time()
+            if delay < -0.1:
+                next_deadline = loop.time()
+            await asyncio.sleep(max(0.0, delay))
             
     except asyncio.CancelledError:
         logger.info("Kiosk loop cancelled")
+        raise
     except Exception as exc:
         logger.exception("Kiosk loop error: %s", exc)
     finally:
-        # Cancel pending recognition task
-        if recognition_task is not None and not recognition_task.done():
-            recognition_task.cancel()
-            try:
-                await recognition_task
-            except asyncio.CancelledError:
-                pass
-        
-        camera.close()
+        # Shielded so a shutdown timeout can't interrupt the cleanup
+        with anyio.CancelScope(shield=True):
+            # Cancel pending recognition task
+            if recognition_task is not None and not recognition_task.done():
+                recognition_task.cancel()
+                try:
+                    await recognition_task
+                except asyncio.CancelledError:
+                    pass
+            
+            recognition_pool.shutdown(wait=False)
+            jpeg_pool.shutdown(wait=False)
+            # Waits for the grabber thread to let go of the device
+            await loop.run_in_executor(None, camera.close)
         kiosk_state.running = False
         kiosk_state.camera_connected = False
         logger.info("Kiosk loop stopped")
 
 
-async def start_kiosk() -> asyncio.Task:
-    """Start the kiosk loop as a background task."""
+def start_kiosk(task_group: TaskGroup) -> bool:
+    """Start the kiosk loop in the task group; returns whether it was started."""
     rs = get_runtime_settings()
     if not rs.kiosk_enabled:
         logger.info("Kiosk is disabled in settings")
-        return None
+        return False
     
-    task = asyncio.create_task(kiosk_loop())
-    return task
+    # Marked running before the loop starts, so stop_kiosk() can't be missed
+    kiosk_state.running = True
+    task_group.start_soon(kiosk_loop, name="kiosk-loop")
+    return True
 
 
 def stop_kiosk() -> None:
@@ -2,8 +2,9 @@
 import asyncio
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, Sequence
 
 import numpy as np
 
@@ -11,8 +12,8 @@ import numpy as np
 @dataclass
 class RecognitionEvent:
     """A recognition event to broadcast to WebSocket clients."""
-    faces: list[dict]
-    themes_played: list[dict]
+    faces: Sequence[dict]
+    themes_played: Sequence[dict]
     timestamp: float
     process_time_ms: float
 
@@ -21,18 +22,29 @@ class RecognitionEvent:
 class KioskState:
     """Thread-safe shared state for the kiosk."""
     
-    # Current frame with overlays drawn (JPEG bytes)
+    # Current frame with overlays drawn (JPEG bytes). Immutable and replaced
+    # by a single attribute assignment, which is atomic, so it needs no lock.
     _current_frame: Optional[bytes] = None
-    _frame_lock: threading.Lock = field(default_factory=threading.Lock)
     
-    # Latest recognition result
-    _latest_faces: list[dict] = field(default_factory=list)
+    # Set (and replaced) each time a new frame is published; streamers await it
+    _frame_event: asyncio.Event = field(default_factory=asyncio.Event)
+    _frame_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    # Latest recognition result, plus the same faces as parallel arrays
+    # (boxes, names, matches) for drawing overlays without dict lookups
+    _latest_faces: tuple[dict, ...] = ()
+    _latest_overlay: tuple[np.ndarray, list[str], np.ndarray] = field(
+        default_factory=lambda: (np.empty((0, 4), dtype=np.int32), [], np.empty(0, dtype=bool))
+    )
     _latest_lock: threading.Lock = field(default_factory=threading.Lock)
     
-    # Event queue for WebSocket broadcast
-    _event_queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=100))
+    # Recent events for WebSocket broadcast; the oldest is dropped when full
+    # so slow consumers see fresh results instead of a growing backlog
+    _events: deque = field(default_factory=lambda: deque(maxlen=8))
+    _event_ready: asyncio.Event = field(default_factory=asyncio.Event)
     
     # Stats
+    _stats_lock: threading.Lock = field(default_factory=threading.Lock)
     _frame_count: int = 0
     _fps: float = 0.0
     _last_fps_time: float = field(default_factory=time.time)
@@ -42,10 +54,27 @@ class KioskState:
     _running: bool = False
     _camera_connected: bool = False
     
+    # Clients consuming published frames; the loop skips drawing and
+    # encoding frames while there are none (only touched on the event loop)
+    _subscriber_count: int = 0
+    
     def set_frame(self, frame_bytes: bytes) -> None:
         """Update the current frame (thread-safe)."""
-        with self._frame_lock:
-            self._current_frame = frame_bytes
+        self._current_frame = frame_bytes
+        self.count_frame()
+        
+        # Wake any streamers waiting for a frame (may be called off-loop)
+        loop = self._frame_loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._notify_frame)
+            except RuntimeError:
+                # Event loop already closed
+                pass
+    
+    def count_frame(self) -> None:
+        """Count a processed frame in the FPS stats, published or not (thread-safe)."""
+        with self._stats_lock:
             self._frame_count += 1
             self._fps_frame_count += 1
             
@@ -57,52 +86,102 @@ class KioskState:
                 self._fps_frame_count = 0
                 self._last_fps_time = now
     
+    def _notify_frame(self) -> None:
+        """Wake all frame waiters (must run on the event loop)."""
+        event = self._frame_event
+        self._frame_event = asyncio.Event()
+        event.set()
+    
+    async def wait_for_frame(self) -> Optional[bytes]:
+        """Wait until a new frame is published and return it."""
+        self._frame_loop = asyncio.get_running_loop()
+        await self._frame_event.wait()
+        return self.get_frame()
+    
     def get_frame(self) -> Optional[bytes]:
         """Get the current frame (thread-safe)."""
-        with self._frame_lock:
-            return self._current_frame
+        return self._current_frame
+    
+    def add_subscriber(self) -> None:
+        """Register a consumer of published frames."""
+        self._subscriber_count += 1
+    
+    def remove_subscriber(self) -> None:
+        """Unregister a consumer added with add_subscriber()."""
+        self._subscriber_count = max(0, self._subscriber_count - 1)
+    
+    @property
+    def has_subscribers(self) -> bool:
+        """Whether any client currently wants published frames."""
+        return self._subscriber_count > 0
+    
+    def set_faces(self, faces: Sequence[dict]) -> None:
+        """Update the latest face recognition results (thread-safe).
+        
+        The face dicts are shared, not copied, and must not be modified
+        afterwards.
+        """
+        boxes = np.array(
+            [(f["box"]["x"], f["box"]["y"], f["box"]["width"], f["box"]["height"]) for f in faces],
+            dtype=np.int32,
+        ).reshape(-1, 4)
+        names = [f["name"] for f in faces]
+        matches = np.array([f["is_match"] for f in faces], dtype=bool)
+        with self._latest_lock:
+            self._latest_faces = tuple(faces)
+            self._latest_overlay = (boxes, names, matches)
     
-    def set_faces(self, faces: list[dict]) -> None:
-        """Update the latest face recognition results (thread-safe)."""
+    def get_faces(self) -> Sequence[dict]:
+        """Get the latest face recognition results (thread-safe).
+        
+        Returned as-is: the tuple and its face dicts must not be modified.
+        """
         with self._latest_lock:
-            self._latest_faces = faces.copy()
+            return self._latest_faces
     
-    def get_faces(self) -> list[dict]:
-        """Get the latest face recognition results (thread-safe)."""
+    def get_face_overlay(self) -> tuple[np.ndarray, list[str], np.ndarray]:
+        """Get the latest faces as (boxes, names, matches) arrays (thread-safe).
+        
+        The arrays are replaced, never modified, so they are returned as-is
+        and must not be modified by the caller.
+        """
         with self._latest_lock:
-            return self._latest_faces.copy()
+            return self._latest_overlay
     
     def push_event(self, event: RecognitionEvent) -> None:
-        """Push a recognition event to the queue (non-blocking)."""
-        try:
-            self._event_queue.put_nowait(event)
-        except asyncio.QueueFull:
-            # Drop oldest event and add new one
-            try:
-                self._event_queue.get_nowait()
-                self._event_queue.put_nowait(event)
-            except asyncio.QueueEmpty:
-                pass
+        """Push a recognition event (non-blocking, drops the oldest when full)."""
+        self._events.append(event)
+        self._event_ready.set()
     
     async def get_event(self) -> RecognitionEvent:
         """Wait for and return the next recognition event."""
-        return await self._event_queue.get()
+        while not self._events:
+            self._event_ready.clear()
+            await self._event_ready.wait()
+        
+        event = self._events.popleft()
+        if not self._events:
+            self._event_ready.clear()
+        return event
     
     def get_event_nowait(self) -> Optional[RecognitionEvent]:
-        """Get an event without waiting, returns None if queue is empty."""
+        """Get an event without waiting, returns None if none are pending."""
         try:
-            return self._event_queue.get_nowait()
-        except asyncio.QueueEmpty:
+            event = self._events.popleft()
+        except IndexError:
             return None
+        if not self._events:
+            self._event_ready.clear()
+        return event
     
     @property
     def frame_count(self) -> int:
-        with self._frame_lock:
+        with self._stats_lock:
             return self._frame_count
     
     @property
     def fps(self) -> float:
-        with self._frame_lock:
+        with self._stats_lock:
             # If no recent update, calculate current FPS
             now = time.time()
             elapsed = now - self._last_fps_time
@@ -127,6 +206,54 @@ class KioskState:
         self._camera_connected = value
 
 
+class FrameBroadcaster:
+    """Fans out published frames to all streaming clients.
+    
+    A single producer task waits for new frames and formats the part header
+    once per frame. Each subscriber gets a 1-slot queue that always holds the
+    latest (header, frame) pair, so slow clients skip frames instead of
+    holding back the producer.
+    """
+    
+    def __init__(self, state: KioskState, header_template: bytes):
+        self._state = state
+        self._header_template = header_template
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+    
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client, starting the producer if needed."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.add(queue)
+        self._state.add_subscriber()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a client, stopping the producer when none are left."""
+        if queue in self._subscribers:
+            self._subscribers.discard(queue)
+            self._state.remove_subscriber()
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    async def _run(self) -> None:
+        """Producer: publish each new frame to every subscriber."""
+        while True:
+            frame = await self._state.wait_for_frame()
+            if frame is None:
+                continue
+            
+            part = (self._header_template % len(frame), frame)
+            for queue in self._subscribers:
+                # Replace any frame the client has not picked up yet
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(part)
+
+
 # Global kiosk state instance
 kiosk_state = KioskState()
 
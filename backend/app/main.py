@@ -1,12 +1,32 @@
 """Stinger - Local Face Recognition with Theme Playback."""
 import asyncio
+import atexit
+import copy
 import logging
+import logging.handlers
+import math
+import os
+import queue
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI
+import anyio
+from anyio.abc import TaskGroup
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
+from starlette.responses import Response
+from starlette.types import Scope
+
+try:
+    from pyinstrument import Profiler
+except ImportError:
+    # Optional: only used to profile requests with ?profile=1 in debug mode
+    Profiler = None
 
 from .api.people import router as people_router
 from .api.recognize import router as recognize_router
@@ -16,34 +36,114 @@ from .core.config import settings, get_runtime_settings
 from .core.face import engine
 from .core.models import HealthResponse
 from .kiosk.loop import start_kiosk, stop_kiosk
+from .kiosk.state import kiosk_state
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener's handler.
+    
+    The stdlib prepare() formats the whole record, tracebacks included, on
+    the calling thread. Here only the message arguments are merged, so later
+    changes to mutable arguments can't show up in the log line.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _configure_logging() -> None:
+    """Send all logging through a queue drained by a background thread.
+    
+    Callers (request handlers, the kiosk loop, worker threads) only merge
+    the message and enqueue the record; formatting and writing to stderr,
+    with the handler lock around it, happen on the listener thread.
+    Uvicorn's own loggers are routed through it too.
+    """
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s: %(name)s: %(message)s"))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    
+    root = logging.getLogger()
+    root.handlers[:] = [_DeferredQueueHandler(log_queue)]
+    root.setLevel(logging.INFO if not settings.debug else logging.DEBUG)
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+    
+    listener.start()
+    # Flush what is still queued on exit
+    atexit.register(listener.stop)
+
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO if not settings.debug else logging.DEBUG,
-    format="%(levelname)s: %(name)s: %(message)s",
-)
+_configure_logging()
 logger = logging.getLogger(__name__)
 
-# Global kiosk task reference
-_kiosk_task: Optional[asyncio.Task] = None
+# How long shutdown waits for the kiosk loop to stop before cancelling it
+KIOSK_STOP_TIMEOUT = 5.0
 
+# Built frontend (backend/static, independent of the working directory);
+# Vite puts content-hashed bundles under assets/
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+STATIC_ASSETS_DIR = "assets"
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan handler."""
-    global _kiosk_task
+
+class FrontendStaticFiles(StaticFiles):
+    """StaticFiles with cache headers suited to the Vite build.
     
-    # Startup
-    logger.info("Starting Stinger...")
-    logger.info("Initializing face recognition engine...")
-    engine.initialize()
+    Hashed assets never change under the same name, so browsers may keep
+    them for good; everything else (index.html) is revalidated against its
+    ETag on every load so new builds are picked up.
+    """
     
-    if engine.cuda_error:
-        logger.error("Face recognition engine failed to start: %s", engine.cuda_error)
-    else:
-        logger.info("Loading people gallery...")
-        engine.load_gallery()
-        logger.info("Startup complete. %d people loaded.", len(engine.people))
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if path.split(os.sep, 1)[0] == STATIC_ASSETS_DIR:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+async def _start_engine_and_kiosk(task_group: TaskGroup) -> None:
+    """Warm up the engine off the event loop, then start the kiosk on it."""
+    # Model and gallery loading are native-heavy and release the GIL, so
+    # running them in worker threads keeps requests flowing meanwhile
+    # Failures are logged rather than raised: an exception here would take
+    # down the task group and the app with it, while the API can keep
+    # serving with model_loaded=false
+    try:
+        logger.info("Initializing face recognition engine...")
+        await asyncio.to_thread(engine.initialize)
+        
+        if engine.cuda_error:
+            logger.error("Face recognition engine failed to start: %s", engine.cuda_error)
+        else:
+            logger.info("Loading people gallery...")
+            await asyncio.to_thread(engine.load_gallery)
+            logger.info("Startup complete. %d people loaded.", engine.people_count)
+    except asyncio.CancelledError:
+        # Shutdown cancelling the task group must still propagate
+        if task_group.cancel_scope.cancel_called:
+            raise
+        logger.error("Engine warm-up was cancelled", exc_info=True)
+        return
+    except Exception as exc:
+        logger.exception("Engine warm-up failed: %s", exc)
+        return
+    finally:
+        # People requests are held off only while this is in progress
+        engine.warming_up = False
+    
+    # The lifespan sets a deadline once shutdown begins; don't open the
+    # camera if that happened while the engine was warming up
+    if task_group.cancel_scope.deadline != math.inf:
+        logger.info("Shutting down, not starting the kiosk")
+        return
     
     # Start kiosk background task (only if engine initialized successfully)
     rs = get_runtime_settings()
@@ -51,25 +151,44 @@ async def lifespan(app: FastAPI):
         logger.error("Kiosk will not start: CUDA is required but not available")
     elif rs.kiosk_enabled:
         logger.info("Starting kiosk background task...")
-        _kiosk_task = await start_kiosk()
+        start_kiosk(task_group)
     else:
         logger.info("Kiosk is disabled")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan handler.
     
-    yield
-    
-    # Shutdown
-    logger.info("Shutting down Stinger...")
+    The server accepts requests right away; models and the gallery load in
+    the background, during which /api/health reports model_loaded=false and
+    recognition answers 503.
+    """
+    # Startup
+    logger.info("Starting Stinger...")
     
-    # Stop kiosk
-    if _kiosk_task is not None:
-        logger.info("Stopping kiosk...")
-        stop_kiosk()
-        try:
-            _kiosk_task.cancel()
-            await asyncio.wait_for(_kiosk_task, timeout=5.0)
-        except (asyncio.CancelledError, asyncio.TimeoutError):
-            pass
+    # Background tasks live in this task group; leaving it waits for them
+    async with anyio.create_task_group() as task_group:
+        engine.warming_up = True
+        task_group.start_soon(_start_engine_and_kiosk, task_group, name="engine-warmup")
+        
+        yield
+        
+        # Shutdown
+        logger.info("Shutting down Stinger...")
+        
+        # Stop kiosk: ask the loop to finish (releasing the camera), and
+        # cancel whatever is still running once the timeout expires
+        if kiosk_state.running:
+            logger.info("Stopping kiosk...")
+            stop_kiosk()
+        task_group.cancel_scope.deadline = anyio.current_time() + KIOSK_STOP_TIMEOUT
     
+    if task_group.cancel_scope.cancelled_caught:
+        logger.warning(
+            "Background tasks did not stop within %gs and were cancelled",
+            KIOSK_STOP_TIMEOUT,
+        )
     logger.info("Shutdown complete")
 
 
@@ -78,15 +197,11 @@ app = FastAPI(
     description="Local face recognition with theme song playback",
     version="1.0.0",
     lifespan=lifespan,
-)
-
-# CORS middleware - allow all origins for local network access
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Interactive docs are a development aid; don't build or expose the
+    # OpenAPI schema on the kiosk otherwise
+    docs_url="/docs" if settings.debug else None,
+    redoc_url="/redoc" if settings.debug else None,
+    openapi_url="/openapi.json" if settings.debug else None,
 )
 
 # API routes
@@ -96,31 +211,103 @@ app.include_router(kiosk_router, prefix="/api")
 app.include_router(settings_router, prefix="/api")
 
 
+# Serialized /api/health body, reused until one of its inputs changes
+_health_cache: tuple[Optional[tuple], bytes] = (None, b"")
+
+
 # Health check
 @app.get("/api/health", response_model=HealthResponse, tags=["health"])
 async def health_check():
     """Health check endpoint."""
-    return HealthResponse(
-        status="ok",
-        model_loaded=engine.is_initialized,
-        people_count=len(engine.people),
+    global _health_cache
+    
+    key = (engine.is_ready, engine.people_count)
+    if _health_cache[0] != key:
+        model_loaded, people_count = key
+        health = HealthResponse(
+            status="ok",
+            model_loaded=model_loaded,
+            people_count=people_count,
+        )
+        _health_cache = (key, health.model_dump_json().encode())
+    
+    # Return the cached body directly, skipping response_model re-validation
+    return Response(content=_health_cache[1], media_type="application/json")
+
+
+# Serve static files for frontend (in production, once it has been built).
+# The directory is checked here once, so StaticFiles needn't check it again.
+if STATIC_DIR.is_dir():
+    app.mount(
+        "/",
+        FrontendStaticFiles(directory=STATIC_DIR, html=True, check_dir=False),
+        name="static",
     )
+else:
+    logger.info("No frontend build in %s, serving the API only", STATIC_DIR)
 
 
-# Serve static files for frontend (in production)
-try:
-    app.mount("/", StaticFiles(directory="static", html=True), name="static")
-except Exception:
-    # Static directory may not exist yet
-    pass
+# Middleware goes on once every route and mount is in place, so the stack
+# built on the first request is final.
+
+# CORS middleware - only configured origins (the frontend itself is
+# same-origin); no cookies are used, so credentials stay off
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.allowed_origins,
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Content-Type"],
+)
+
+# Compress JSON and frontend assets; media and the MJPEG stream (already
+# compressed, and a stream must not be buffered) pass through untouched
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ("multipart/x-mixed-replace",),
+)
+
+# Request profiling (debug only): add ?profile=1 to any request to get a
+# pyinstrument call graph instead of the response
+if settings.debug and Profiler is not None:
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        """Profile the request when asked to, returning the HTML report."""
+        if not request.query_params.get("profile"):
+            return await call_next(request)
+        
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        response = await call_next(request)
+        # Drain the body so streaming work is profiled and the stream closed
+        async for _ in response.body_iterator:
+            pass
+        profiler.stop()
+        return HTMLResponse(profiler.output_html())
 
 
 if __name__ == "__main__":
     import uvicorn
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        # Optional: installed with uvicorn[standard] everywhere but Windows
+        loop = "asyncio"
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        loop=loop,
+        # httptools is picked automatically when installed; the browser keeps
+        # polling the API, so hold idle connections open well past the 5s default
+        timeout_keep_alive=30,
+        limit_concurrency=200,
+        backlog=512,
+        # Formatting an access log line is a noticeable share of tiny requests
+        access_log=settings.debug,
     )
 
@@ -87,6 +87,7 @@ export function serializeCameraMasks(masks: MaskRect[]): string {
 
 export interface FaceMatch {
   box: FaceBox;
+  box_norm?: FaceBox;  // Box as fractions of the frame size (kiosk events only)
   name: string;
   distance: number;
   is_match: boolean;
@@ -125,6 +126,11 @@ export interface ConfigSettings {
   camera_width: number;
   camera_height: number;
   use_cuda: boolean;
+  use_tensorrt: boolean;
+  use_int8: boolean;
+  use_opencl: boolean;
+  gallery_int8: boolean;
+  overlay_client_side: boolean;
   onnx_providers: string[];
   active_provider: string | null;
   cuda_error: string | null;
@@ -140,6 +146,7 @@ export interface RuntimeSettings {
   audio_cooldown_seconds: number;
   camera_fps: number;
   camera_masks: string;  // JSON string of MaskRect[]
+  blank_masked_regions: boolean;
   mirror_feed: boolean;
   kiosk_enabled: boolean;
   recognition_interval_ms: number;
@@ -161,6 +168,7 @@ export interface RuntimeSettingsUpdate {
   audio_cooldown_seconds?: number;
   camera_fps?: number;
   camera_masks?: string;
+  blank_masked_regions?: boolean;
   mirror_feed?: boolean;
   kiosk_enabled?: boolean;
   recognition_interval_ms?: number;
@@ -286,11 +294,13 @@ class ApiClient {
   }
 
   // Recognition
-  async recognizeImage(imageBase64: string): Promise<RecognitionResult> {
-    return this.request<RecognitionResult>('/recognize', {
+  async recognizeImage(file: File): Promise<RecognitionResult> {
+    const formData = new FormData();
+    formData.append('file', file);
+
+    return this.request<RecognitionResult>('/recognize/upload', {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ image_base64: imageBase64 }),
+      body: formData,
     });
   }
 
@@ -12,8 +12,12 @@ interface RecognitionMessage {
   camera_connected?: boolean
   fps?: number
   people_count?: number
+  overlay_client_side?: boolean
 }
 
+// Kiosk WebSocket messages arrive as binary frames containing UTF-8 JSON
+const messageDecoder = new TextDecoder()
+
 interface FaceHistoryEntry {
   name: string
   visibleSince: number
@@ -30,6 +34,9 @@ export default function LiveView() {
   const [processTime, setProcessTime] = useState<number>(0)
   const [maskEditorOpen, setMaskEditorOpen] = useState(false)
   const [masks, setMasks] = useState<MaskRect[]>([])
+  // Set when the server leaves overlays off the stream for us to draw
+  const [clientOverlay, setClientOverlay] = useState(false)
+  const [overlayFaces, setOverlayFaces] = useState<FaceMatch[]>([])
   
   const wsRef = useRef<WebSocket | null>(null)
   const reconnectTimeoutRef = useRef<number | null>(null)
@@ -105,6 +112,7 @@ export default function LiveView() {
     
     try {
       wsRef.current = new WebSocket(wsUrl)
+      wsRef.current.binaryType = 'arraybuffer'
       
       wsRef.current.onopen = () => {
         console.log('Kiosk WebSocket connected')
@@ -114,7 +122,10 @@ export default function LiveView() {
       
       wsRef.current.onmessage = (event) => {
         try {
-          const message: RecognitionMessage = JSON.parse(event.data)
+          const text = typeof event.data === 'string'
+            ? event.data
+            : messageDecoder.decode(event.data as ArrayBuffer)
+          const message: RecognitionMessage = JSON.parse(text)
           handleMessage(message)
         } catch (err) {
           console.error('Failed to parse message:', err)
@@ -148,6 +159,7 @@ export default function LiveView() {
   function handleMessage(message: RecognitionMessage) {
     if (message.type === 'recognition' && message.faces) {
       const now = Date.now()
+      setOverlayFaces(message.faces)
       
       setFaceHistory(prev => {
         const updated = new Map(prev)
@@ -185,6 +197,10 @@ export default function LiveView() {
       }
     }
     
+    if (message.type === 'status' && message.overlay_client_side !== undefined) {
+      setClientOverlay(message.overlay_client_side)
+    }
+    
     if (message.type === 'status' || message.type === 'heartbeat') {
       setStatus(prev => ({
         running: message.running ?? prev?.running ?? false,
@@ -286,11 +302,14 @@ export default function LiveView() {
           <div className="card overflow-hidden">
             <div className="aspect-video bg-stinger-bg relative">
               {status?.running && status?.camera_connected ? (
-                <img
-                  src="/api/kiosk/stream"
-                  alt="Live Camera Feed"
-                  className="w-full h-full object-contain"
-                />
+                <>
+                  <img
+                    src="/api/kiosk/stream"
+                    alt="Live Camera Feed"
+                    className="w-full h-full object-contain"
+                  />
+                  {clientOverlay && <StreamOverlay faces={overlayFaces} masks={masks} />}
+                </>
               ) : (
                 <div className="absolute inset-0 flex flex-col items-center justify-center text-stinger-muted">
                   {status?.cuda_error ? (
@@ -391,6 +410,46 @@ export default function LiveView() {
   )
 }
 
+/**
+ * Face boxes and masks drawn over the stream, for servers that leave them
+ * off the video (OVERLAY_CLIENT_SIDE). Positions are fractions of the frame,
+ * which fills the 16:9 container for the default 1280x720 camera.
+ */
+function StreamOverlay({ faces, masks }: { faces: FaceMatch[]; masks: MaskRect[] }) {
+  const percent = (rect: { x: number; y: number; width: number; height: number }) => ({
+    left: `${rect.x * 100}%`,
+    top: `${rect.y * 100}%`,
+    width: `${rect.width * 100}%`,
+    height: `${rect.height * 100}%`,
+  })
+  
+  return (
+    <div className="absolute inset-0 pointer-events-none">
+      {masks.map((mask, i) => (
+        <div key={`mask-${i}`} className="absolute bg-white/50" style={percent(mask)} />
+      ))}
+      {faces.map((face, i) => {
+        if (!face.box_norm) return null
+        const color = face.is_match ? '#00ff88' : '#ff4444'
+        return (
+          <div
+            key={`face-${i}`}
+            className="absolute border-2"
+            style={{ ...percent(face.box_norm), borderColor: color }}
+          >
+            <span
+              className="absolute left-0 top-full mt-1 px-1.5 py-0.5 bg-black text-xs font-bold whitespace-nowrap"
+              style={{ color }}
+            >
+              {face.is_match ? face.name : 'Unknown'}
+            </span>
+          </div>
+        )
+      })}
+    </div>
+  )
+}
+
 function StatusBadge({ label, active }: { label: string; active: boolean }) {
   return (
     <div className={`flex items-center gap-2 px-3 py-1.5 rounded-full text-sm ${
@@ -44,6 +44,7 @@ const runtimeSettingGroups: RuntimeSettingGroup[] = [
       { key: 'recognition_interval_ms', label: 'Recognition Interval', description: 'Milliseconds between recognition attempts', type: 'number', min: 50, max: 2000, step: 50 },
       { key: 'camera_fps', label: 'Target FPS', description: 'Target frames per second for camera capture', type: 'number', min: 1, max: 60 },
       { key: 'mirror_feed', label: 'Mirror Feed', description: 'Flip the video feed horizontally (selfie mode)', type: 'boolean' },
+      { key: 'blank_masked_regions', label: 'Blank Masked Regions', description: 'Black out masks before detection instead of ignoring faces centred in them', type: 'boolean' },
     ],
   },
   {
@@ -235,6 +236,11 @@ export default function Settings() {
           <ConfigItem label="Camera" value={`Device ${configSettings.camera_device}`} />
           <ConfigItem label="Resolution" value={`${configSettings.camera_width}x${configSettings.camera_height}`} />
           <ConfigItem label="Use CUDA" value={configSettings.use_cuda ? 'Enabled' : 'Disabled'} />
+          <ConfigItem label="Use TensorRT" value={configSettings.use_tensorrt ? 'Enabled' : 'Disabled'} />
+          <ConfigItem label="INT8 on CPU" value={configSettings.use_int8 ? 'Enabled' : 'Disabled'} />
+          <ConfigItem label="OpenCL Resizing" value={configSettings.use_opencl ? 'Enabled' : 'Disabled'} />
+          <ConfigItem label="INT8 Gallery" value={configSettings.gallery_int8 ? 'Enabled' : 'Disabled'} />
+          <ConfigItem label="Browser Overlays" value={configSettings.overlay_client_side ? 'Enabled' : 'Disabled'} />
         </div>
       </div>
 
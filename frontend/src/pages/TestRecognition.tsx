@@ -20,19 +20,14 @@ export default function TestRecognition() {
     const url = URL.createObjectURL(file)
     setImageUrl(url)
 
-    // Convert to base64 and send for recognition
-    const reader = new FileReader()
-    reader.onload = async () => {
-      const base64 = (reader.result as string).split(',')[1]
-      await recognizeImage(base64)
-    }
-    reader.readAsDataURL(file)
+    // Upload the raw file for recognition
+    await recognizeImage(file)
   }
 
-  async function recognizeImage(base64: string) {
+  async function recognizeImage(file: File) {
     setLoading(true)
     try {
-      const recognitionResult = await api.recognizeImage(base64)
+      const recognitionResult = await api.recognizeImage(file)
       setResult(recognitionResult)
       drawBoxes(recognitionResult.faces)
     } catch (err) {